@@ -12,6 +12,7 @@ from __future__ import annotations
 import math
 import os
 import sqlite3
+import threading
 from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List, Optional
@@ -23,6 +24,7 @@ import talib
 from tradingagents.dataflows.binance import (
     BINANCE_DB_PATH,
     INDICATOR_COLUMNS,
+    clear_market_cache,
     ensure_cache_db,
     get_table_for_interval,
 )
@@ -50,6 +52,19 @@ class BinanceAPIError(RuntimeError):
     """当 Binance 接口返回错误时抛出，方便上层统一处理。"""
 
 
+# 每个抓取线程持有一个 keep-alive Session，复用 TCP/TLS 连接；
+# requests.Session 不保证线程安全，因此不在线程池 worker 之间共享。
+_thread_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+
 def _store_klines(
     symbol: str,
     interval: str,
@@ -123,9 +138,9 @@ def _compute_indicators(df: pd.DataFrame) -> pd.DataFrame:
     if df.empty:
         return df
     df = df.copy()
-    close = df["close"].astype(float).to_numpy(copy=False)
-    high = df["high"].astype(float).to_numpy(copy=False)
-    low = df["low"].astype(float).to_numpy(copy=False)
+    close = df["close"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
 
     df["ema_5"] = talib.EMA(close, timeperiod=5)
     df["ema_10"] = talib.EMA(close, timeperiod=10)
@@ -294,7 +309,7 @@ def _request_klines_api(
     payload = None
     for endpoint in endpoints:
         try:
-            resp = requests.get(endpoint, params=params, timeout=15)
+            resp = _get_session().get(endpoint, params=params, timeout=15)
         except requests.RequestException as exc:
             last_error = f"Failed to call Binance endpoint {endpoint}: {exc}"
             continue
@@ -351,6 +366,8 @@ def fetch_and_store_klines(
     _recompute_and_store_indicators(
         symbol, interval, recent_count=len(klines), table=table
     )
+    # 库中行情已更新，丢弃进程内的行情文本缓存
+    clear_market_cache()
     return klines
 
 
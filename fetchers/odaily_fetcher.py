@@ -18,7 +18,7 @@ from typing import Any, Dict, List
 
 import feedparser
 
-from tradingagents.dataflows.odaily import DB_PATH, ensure_db
+from tradingagents.dataflows.odaily import DB_PATH, clear_candidate_cache, ensure_db
 
 ODAILY_NEWSFLASH_URL = "https://rss.odaily.news/rss/newsflash"
 ODAILY_ARTICLE_URL = "https://rss.odaily.news/rss/post"
@@ -153,6 +153,8 @@ def _fetch_and_store(feed_url: str, table: str) -> List[Dict[str, Any]]:
         if record["entry_id"]:
             _upsert(table, record)
             entries.append(record)
+    if entries:
+        clear_candidate_cache()
     return entries
 
 
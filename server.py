@@ -1,7 +1,6 @@
 import json
 import os
 import sqlite3
-from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -13,11 +12,11 @@ from tradingagents.dataflows.binance import BINANCE_DB_PATH, load_cached_klines
 from tradingagents.dataflows.trader_round_memory import TraderRoundMemoryStore
 from tradingagents.dataflows.trace_store import TraceStore
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.graph.trading_graph import TradingAgentsGraph
 
 from trigger import (
     configure_scheduler,
     execute_startup_tasks,
+    init_trading_graph,
 )
 
 
@@ -95,11 +94,8 @@ class SchedulerManager:
 
 
 config = DEFAULT_CONFIG.copy()
-graph = TradingAgentsGraph(
-    debug=True,
-    config=config,
-    selected_analysts=["market", "newsflash", "longform"],
-)
+# 与定时任务共用同一个图实例，避免重复创建 LLM 客户端、Chroma 连接与线程池
+graph = init_trading_graph()
 memory_store = TraderRoundMemoryStore(
     config.get("trader_round_db_path")
     or os.path.join(config["results_dir"], "trader_round_memory.db")
@@ -0,0 +1,40 @@
+import unittest
+
+from tradingagents.dataflows.order_fill import OrderFill, _first_float
+
+
+class OrderFillTest(unittest.TestCase):
+    def test_zero_fill_reports_zero_notional(self):
+        fill = OrderFill.from_response(
+            {
+                "symbol": "BTCUSDT",
+                "side": "BUY",
+                "orderId": 0,
+                "executedQty": "0",
+                "avgPrice": "0.00000",
+                "cumQuote": "0.00000",
+                "status": "NEW",
+            }
+        )
+        self.assertEqual(fill.order_id, 0)
+        self.assertEqual(fill.executed_qty, 0.0)
+        self.assertEqual(fill.executed_qty_text, "0")
+        self.assertEqual(fill.notional, 0.0)
+
+    def test_notional_falls_back_to_avg_price_times_qty(self):
+        fill = OrderFill.from_response(
+            {"symbol": "ETHUSDT", "side": "SELL", "order_id": 7, "avg_price": "2000", "executed_qty": "3"}
+        )
+        self.assertEqual(fill.order_id, 7)
+        self.assertEqual(fill.executed_qty_text, "3")
+        self.assertEqual(fill.notional, 6000.0)
+
+    def test_first_float_skips_unparsable_key(self):
+        self.assertEqual(
+            _first_float({"executedQty": "n/a", "executed_qty": "1.5"}, "executedQty", "executed_qty"),
+            1.5,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,57 @@
 from datetime import date
 from typing import Sequence
-from langchain_core.messages import BaseMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import BaseMessage, SystemMessage
 
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import StateGraph, MessagesState, START, END
 
 from tradingagents.agents.utils.agent_utils import (
+    extract_message_text,
     get_crypto_longform_candidates,
     get_crypto_article_content,
 )
 from tradingagents.dataflows.odaily import save_longform_analysis
 from tradingagents.constants import DEFAULT_ASSETS
 
+# 静态提示词骨架在模块导入时构建一次，调用时只填入日期与资产列表。
+_LONGFORM_SYSTEM_TEMPLATE = (
+    "你隶属于一个多智能体的加密研究团队。"
+    " 当前日期：{current_date}，请重点关注以下资产相关的叙事：{focus_assets}。\n"
+    + """
+你是加密市场的长文研究员，负责阅读 Odaily 深度文章，提炼可持续的基本面主题并写入缓存。请严格按照以下步骤执行：
+1. 调用候选列表工具获取过去几天的长文标题，并记录发布日期。
+2. 选择与当前关注资产（{focus_assets}）或其上游叙事最相关的文章，调用内容工具获取全文。
+3. 对每篇文章提炼“观点 / 支撑论据 / 关键风险”，并标注它主要影响哪些资产/生态。
+4. 在整体结论中说明主流叙事、逆势观点、潜在催化剂以及对仓位的启示。
+5. 只输出单行 JSON，不得混入其它文字。
+
+JSON 结构示例：
+{{
+  "analysis_date": "YYYY-MM-DD",
+  "focus_assets": ["{focus_assets}"],
+  "themes": [
+    {{
+      "title": "文章或主题标题",
+      "primary_assets": ["涉及资产"],
+      "sentiment": "bullish|bearish|neutral",
+      "thesis": "核心观点",
+      "arguments": ["论据1","论据2"],
+      "risks": ["风险提示1","风险提示2"],
+      "contrarian": "若与主流相反则说明原因"
+    }}
+  ],
+  "narrative_summary": {{
+    "dominant": "当前主流叙事",
+    "contrarian": "逆势观点",
+    "event_triggers": ["催化剂/关键事件"]
+  }},
+  "trading_implications": {{
+    "positioning": "仓位/敞口建议或触发条件"
+  }}
+}}
+""".strip()
+)
+
 
 def create_crypto_longform_analyst(llm):
     """
@@ -43,16 +82,11 @@ def create_crypto_longform_analyst(llm):
         def call_model(state: MessagesState):
             messages = state["messages"]
 
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    ("system", system_message),
-                    MessagesPlaceholder(variable_name="messages"),
-                ]
+            # system prompt 为已渲染好的静态字符串，直接拼接消息列表调用，
+            # 省去每轮工具循环中的模板渲染与 Runnable 链路开销。
+            response = llm_with_tools.invoke(
+                [SystemMessage(content=system_message), *messages]
             )
-
-            chain = prompt | llm_with_tools
-            # 这里传入的是 {"messages": messages}，对应 MessagesPlaceholder
-            response = chain.invoke({"messages": messages})
             return {"messages": [response]}
 
         builder = StateGraph(MessagesState)
@@ -71,44 +105,8 @@ def create_crypto_longform_analyst(llm):
         current_date = state.get("trade_date") or date.today().isoformat()
         assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
         focus_assets = ", ".join(assets)
-        base_system_message = f"""
-你是加密市场的长文研究员，负责阅读 Odaily 深度文章，提炼可持续的基本面主题并写入缓存。请严格按照以下步骤执行：
-1. 调用候选列表工具获取过去几天的长文标题，并记录发布日期。
-2. 选择与当前关注资产（{focus_assets}）或其上游叙事最相关的文章，调用内容工具获取全文。
-3. 对每篇文章提炼“观点 / 支撑论据 / 关键风险”，并标注它主要影响哪些资产/生态。
-4. 在整体结论中说明主流叙事、逆势观点、潜在催化剂以及对仓位的启示。
-5. 只输出单行 JSON，不得混入其它文字。
-
-JSON 结构示例：
-{{{{
-  "analysis_date": "YYYY-MM-DD",
-  "focus_assets": ["{focus_assets}"],
-  "themes": [
-    {{{{
-      "title": "文章或主题标题",
-      "primary_assets": ["涉及资产"],
-      "sentiment": "bullish|bearish|neutral",
-      "thesis": "核心观点",
-      "arguments": ["论据1","论据2"],
-      "risks": ["风险提示1","风险提示2"],
-      "contrarian": "若与主流相反则说明原因"
-    }}}}
-  ],
-  "narrative_summary": {{{{
-    "dominant": "当前主流叙事",
-    "contrarian": "逆势观点",
-    "event_triggers": ["催化剂/关键事件"]
-  }}}},
-  "trading_implications": {{{{
-    "positioning": "仓位/敞口建议或触发条件"
-  }}}}
-}}}}
-""".strip()
-
-        system_message = (
-            "你隶属于一个多智能体的加密研究团队。"
-            f" 当前日期：{current_date}，请重点关注以下资产相关的叙事：{focus_assets}。\n"
-            f"{base_system_message}"
+        system_message = _LONGFORM_SYSTEM_TEMPLATE.format_map(
+            {"current_date": current_date, "focus_assets": focus_assets}
         )
 
         graph = build_graph(system_message)
@@ -120,8 +118,8 @@ JSON 结构示例：
         final_messages: Sequence[BaseMessage] = result_state["messages"]
         result = final_messages[-1]
 
-        report = result.content or ""
-        if report and isinstance(report, str):
+        report = extract_message_text(result)
+        if report:
             save_longform_analysis(report, analysis_date=current_date)
 
         return {
@@ -1,17 +1,58 @@
 from datetime import date
 from typing import Sequence
-from langchain_core.messages import BaseMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import BaseMessage, SystemMessage
 
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import StateGraph, MessagesState, START, END
 
+from tradingagents.agents.utils.agent_utils import extract_message_text
 from tradingagents.agents.utils.crypto_market_tools import (
     get_crypto_market_batch,
     get_support_resistance_batch,
 )
 from tradingagents.constants import DEFAULT_ASSETS
 
+# 静态提示词骨架在模块导入时构建一次，调用时只填入日期与资产列表。
+_MARKET_SYSTEM_TEMPLATE = (
+    "你隶属于一个多智能体的加密研究团队。"
+    " 当前日期：{current_date}，本轮需要覆盖的资产：{asset_list}。\n"
+    + """
+你是专注于加密市场的技术分析师，必须在一次推理中覆盖多个交易对。对每个资产请严格按以下流程输出，避免模糊表述：
+1) 使用批量工具 `get_crypto_market_batch` / `get_support_resistance_batch`，一次性传入完整资产列表（逗号分隔），获取 OHLCV、成交量、区间与关键价位。
+2) 提炼趋势与指标共识（均线/MACD/KDJ/布林带等），给出失效条件。
+3) 给出 bull/base/bear 三种路径（含 fail_if）。
+4) 对关键压力/支撑是否已突破必须用明确字段表达，不得使用“已接近/可能突破/似乎突破”等模糊文字。
+5) 仅输出单行 JSON，不得附加其他文字。
+
+JSON 结构示例（字段名必须一致）：
+{{
+  "analysis_date": "YYYY-MM-DD",
+  "assets": ["ASSET1","ASSET2"],
+  "per_asset": [
+    {{
+      "symbol": "ASSET1",
+      "trend_summary": "一句话趋势判断（禁止包含“已突破/突破中”等结论式措辞）",
+      "level_status": {{
+        "resistance_level": "关键压力价位（单个数值）",
+        "resistance_state": "below|at|above|broken",
+        "support_level": "关键支撑价位（单个数值）",
+        "support_state": "above|at|below|broken",
+        "state_evidence": "用当前价格与关键位的关系做一句话说明"
+      }},
+      "scenario_map": [
+        {{
+          "case": "bull|base|bear",
+          "path": "行情演绎",
+          "fail_if": "终止条件"
+        }}
+      ],
+      "indicator_summary": "一句话指标共识"
+    }}
+  ]
+}}
+""".strip()
+)
+
 
 def create_crypto_market_analyst(llm):
     """
@@ -45,16 +86,11 @@ def create_crypto_market_analyst(llm):
         def call_model(state: MessagesState):
             messages = state["messages"]
 
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    ("system", system_message),
-                    MessagesPlaceholder(variable_name="messages"),
-                ]
+            # system prompt 为已渲染好的静态字符串，直接拼接消息列表调用，
+            # 省去每轮工具循环中的模板渲染与 Runnable 链路开销。
+            response = llm_with_tools.invoke(
+                [SystemMessage(content=system_message), *messages]
             )
-
-            chain = prompt | llm_with_tools
-            # 这里传入的是 {"messages": messages}，对应 MessagesPlaceholder
-            response = chain.invoke({"messages": messages})
             return {"messages": [response]}
 
         builder = StateGraph(MessagesState)
@@ -72,46 +108,8 @@ def create_crypto_market_analyst(llm):
         assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
         asset_list = ", ".join(assets)
 
-        base_system_message = """
-你是专注于加密市场的技术分析师，必须在一次推理中覆盖多个交易对。对每个资产请严格按以下流程输出，避免模糊表述：
-1) 使用批量工具 `get_crypto_market_batch` / `get_support_resistance_batch`，一次性传入完整资产列表（逗号分隔），获取 OHLCV、成交量、区间与关键价位。
-2) 提炼趋势与指标共识（均线/MACD/KDJ/布林带等），给出失效条件。
-3) 给出 bull/base/bear 三种路径（含 fail_if）。
-4) 对关键压力/支撑是否已突破必须用明确字段表达，不得使用“已接近/可能突破/似乎突破”等模糊文字。
-5) 仅输出单行 JSON，不得附加其他文字。
-
-JSON 结构示例（字段名必须一致）：
-{{
-  "analysis_date": "YYYY-MM-DD",
-  "assets": ["ASSET1","ASSET2"],
-  "per_asset": [
-    {{
-      "symbol": "ASSET1",
-      "trend_summary": "一句话趋势判断（禁止包含“已突破/突破中”等结论式措辞）",
-      "level_status": {{
-        "resistance_level": "关键压力价位（单个数值）",
-        "resistance_state": "below|at|above|broken",
-        "support_level": "关键支撑价位（单个数值）",
-        "support_state": "above|at|below|broken",
-        "state_evidence": "用当前价格与关键位的关系做一句话说明"
-      }},
-      "scenario_map": [
-        {{
-          "case": "bull|base|bear",
-          "path": "行情演绎",
-          "fail_if": "终止条件"
-        }}
-      ],
-      "indicator_summary": "一句话指标共识"
-    }}
-  ]
-}}
-""".strip()
-
-        system_message = (
-            "你隶属于一个多智能体的加密研究团队。"
-            f" 当前日期：{current_date}，本轮需要覆盖的资产：{asset_list}。\n"
-            f"{base_system_message}"
+        system_message = _MARKET_SYSTEM_TEMPLATE.format_map(
+            {"current_date": current_date, "asset_list": asset_list}
         )
 
         graph = build_graph(system_message)
@@ -122,7 +120,7 @@ JSON 结构示例（字段名必须一致）：
         )
         final_messages: Sequence[BaseMessage] = result_state["messages"]
         result = final_messages[-1]
-        report = result.content or ""
+        report = extract_message_text(result)
 
         return {
             "messages": final_messages,
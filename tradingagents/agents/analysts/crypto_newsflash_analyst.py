@@ -1,46 +1,74 @@
 from datetime import date
 from typing import Sequence, Any
-from langchain_core.messages import BaseMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import BaseMessage, SystemMessage, trim_messages
 
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import StateGraph, MessagesState, START, END
 
 from tradingagents.agents.utils.agent_utils import (
+    extract_message_text,
     get_crypto_newsflash_candidates,
     get_crypto_newsflash_content,
 )
 from tradingagents.constants import DEFAULT_ASSETS
 
+# 静态提示词骨架在模块导入时构建一次，调用时只填入日期与资产列表。
+_NEWSFLASH_SYSTEM_TEMPLATE = (
+    "你隶属于一个多智能体的加密研究团队。"
+    " 当前日期：{current_date}，本轮关注资产：{asset_list}。\n"
+    + """
+你是一名加密快讯分析师，需要在一次推理中梳理 Odaily 最新短新闻，并提炼其对多资产组合的影响。
+务必遵循以下流程：
+1. 先调用候选列表工具拉取最近 24h 的快讯标题与时间戳。
+2. 再根据标题挑选与 {asset_list} 直接相关或可能影响这些资产/宏观情绪的条目，调用内容工具时一次性传入逗号分隔的 entry_id 列表批量取回正文。
+3. 将所有快讯压缩为具体的主题集群（监管、链上、宏观、资金流等），概述关键事实、触发背景与方向，不需要逐条列出所有事件。
+4. 对每个集群说明可能受影响的资产以及净效应或潜在矛盾。
+5. 最后仅输出单行 JSON，严格遵守字段定义，不得附加其他文字。
+
+JSON 结构示例：
+{{
+  "analysis_date": "YYYY-MM-DD",
+  "assets": ["ASSET1","ASSET2"],
+  "sentiment_summary": {{
+    "overall": "bullish|bearish|neutral",
+    "confidence": "high|medium|low",
+    "rationale": "一句话说明主因"
+  }},
+  "themes": [
+    {{
+      "theme": "regulation|macro|exchange|onchain|project|security",
+      "highlights": [
+        "关键事件摘要1",
+        "关键事件摘要2"
+      ],
+      "impacted_assets": ["ASSET1","ASSET2"],
+      "net_effect": "bullish|bearish|mixed",
+      "confidence": "high|medium|low"
+    }}
+  ],
+}}
+""".strip()
+)
 
-def _extract_text_from_message(message: Any) -> str:
-    """Best-effort extraction of plain text from a LangChain message."""
-    if message is None:
-        return ""
 
-    content = getattr(message, "content", message)
+# 工具循环中发送给 LLM 的最近消息条数上限（首条任务消息始终保留）
+_MAX_WINDOW_MESSAGES = 12
 
-    if isinstance(content, str):
-        return content
 
-    if isinstance(content, list):
-        parts = []
-        for chunk in content:
-            if isinstance(chunk, str):
-                parts.append(chunk)
-            elif isinstance(chunk, dict):
-                text = (
-                    chunk.get("text")
-                    or chunk.get("content")
-                    or ""
-                )
-                if text:
-                    parts.append(str(text))
-            else:
-                parts.append(str(chunk))
-        return "\n".join(parts)
+def _window_messages(messages: Sequence[BaseMessage]) -> list:
+    """保留首条任务消息 + 最近的若干条消息，避免工具循环中 prompt 无限增长。"""
+    if len(messages) <= _MAX_WINDOW_MESSAGES + 1:
+        return list(messages)
+    # start_on="ai" 保证窗口不会以孤立的 ToolMessage 开头
+    tail = trim_messages(
+        list(messages[1:]),
+        max_tokens=_MAX_WINDOW_MESSAGES,
+        token_counter=len,
+        strategy="last",
+        start_on="ai",
+    )
+    return [messages[0], *tail]
 
-    return str(content)
 
 def create_crypto_newsflash_analyst(llm):
     """
@@ -68,16 +96,11 @@ def create_crypto_newsflash_analyst(llm):
         def call_model(state: MessagesState):
             messages = state["messages"]
 
-            prompt = ChatPromptTemplate.from_messages(
-                [
-                    ("system", system_message),
-                    MessagesPlaceholder(variable_name="messages"),
-                ]
+            # system prompt 为已渲染好的静态字符串，直接拼接消息列表调用，
+            # 省去每轮工具循环中的模板渲染与 Runnable 链路开销。
+            response = llm_with_tools.invoke(
+                [SystemMessage(content=system_message), *_window_messages(messages)]
             )
-
-            chain = prompt | llm_with_tools
-            # 对应 MessagesPlaceholder(variable_name="messages")
-            response = chain.invoke({"messages": messages})
             return {"messages": [response]}
 
         builder = StateGraph(MessagesState)
@@ -95,43 +118,8 @@ def create_crypto_newsflash_analyst(llm):
         current_date = state.get("trade_date") or date.today().isoformat()
         assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
         asset_list = ", ".join(assets)
-        base_system_message = f"""
-你是一名加密快讯分析师，需要在一次推理中梳理 Odaily 最新短新闻，并提炼其对多资产组合的影响。
-务必遵循以下流程：
-1. 先调用候选列表工具拉取最近 24h 的快讯标题与时间戳。
-2. 再根据标题挑选与 {asset_list} 直接相关或可能影响这些资产/宏观情绪的条目，调用内容工具时一次性传入逗号分隔的 entry_id 列表批量取回正文。
-3. 将所有快讯压缩为具体的主题集群（监管、链上、宏观、资金流等），概述关键事实、触发背景与方向，不需要逐条列出所有事件。
-4. 对每个集群说明可能受影响的资产以及净效应或潜在矛盾。
-5. 最后仅输出单行 JSON，严格遵守字段定义，不得附加其他文字。
-
-JSON 结构示例：
-{{{{
-  "analysis_date": "YYYY-MM-DD",
-  "assets": ["ASSET1","ASSET2"],
-  "sentiment_summary": {{{{
-    "overall": "bullish|bearish|neutral",
-    "confidence": "high|medium|low",
-    "rationale": "一句话说明主因"
-  }}}},
-  "themes": [
-    {{{{
-      "theme": "regulation|macro|exchange|onchain|project|security",
-      "highlights": [
-        "关键事件摘要1",
-        "关键事件摘要2"
-      ],
-      "impacted_assets": ["ASSET1","ASSET2"],
-      "net_effect": "bullish|bearish|mixed",
-      "confidence": "high|medium|low"
-    }}}}
-  ],
-}}}}
-""".strip()
-
-        system_message = (
-            "你隶属于一个多智能体的加密研究团队。"
-            f" 当前日期：{current_date}，本轮关注资产：{asset_list}。\n"
-            f"{base_system_message}"
+        system_message = _NEWSFLASH_SYSTEM_TEMPLATE.format_map(
+            {"current_date": current_date, "asset_list": asset_list}
         )
 
         graph = build_graph(system_message)
@@ -143,7 +131,7 @@ JSON 结构示例：
         final_messages: Sequence[BaseMessage] = result_state["messages"]
         result: Any = final_messages[-1]
 
-        report_text = _extract_text_from_message(result)
+        report_text = extract_message_text(result)
         report = report_text or "【错误】快讯分析生成失败。"
 
         return {
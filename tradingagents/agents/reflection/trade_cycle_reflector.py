@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
-import json
 from typing import Any, Dict, Optional, Sequence
 
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from tradingagents.agents.utils.json_utils import extract_json_object, json_dumps
+
 
 def _normalize_content(content: Any) -> str:
     if isinstance(content, str):
@@ -20,17 +23,8 @@ def _extract_json(raw: Any) -> Dict[str, Any]:
     text = _normalize_content(raw).strip()
     if not text:
         return {}
-    try:
-        return json.loads(text)
-    except Exception:
-        start = text.find("{")
-        end = text.rfind("}")
-        if start == -1 or end == -1 or end <= start:
-            return {"raw": text}
-        try:
-            return json.loads(text[start : end + 1])
-        except Exception:
-            return {"raw": text}
+    parsed = extract_json_object(text)
+    return parsed if parsed is not None else {"raw": text}
 
 
 class TradeCycleReflector:
@@ -77,20 +71,21 @@ class TradeCycleReflector:
     def reflect(self, trade_info: Dict[str, Any], state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
         market_context = self._build_market_context(state or {})
         trade_context = self._build_trade_context(trade_info)
+        # 每个上下文只序列化一次，prompt 与持久化的 context 复用同一份字符串。
+        trade_json = json_dumps(trade_context)
+        market_json = json_dumps(market_context)
         messages: Sequence = [
-            ("system", self.system_prompt),
-            (
-                "human",
-                "以下是交易信息与市场上下文，请输出 JSON 复盘：\n"
-                f"TRADE_INFO={json.dumps(trade_context, ensure_ascii=False)}\n"
-                f"CONTEXT={json.dumps(market_context, ensure_ascii=False)}",
+            SystemMessage(content=self.system_prompt),
+            HumanMessage(
+                content=(
+                    "以下是交易信息与市场上下文，请输出 JSON 复盘：\n"
+                    f"TRADE_INFO={trade_json}\n"
+                    f"CONTEXT={market_json}"
+                )
             ),
         ]
         raw = self.llm.invoke(messages).content
         parsed = _extract_json(raw)
-        summary = json.dumps(parsed, ensure_ascii=False)
-        context = json.dumps(
-            {"trade_info": trade_context, "context": market_context},
-            ensure_ascii=False,
-        )
+        summary = json_dumps(parsed)
+        context = f'{{"trade_info":{trade_json},"context":{market_json}}}'
         return {"summary": summary, "context": context}
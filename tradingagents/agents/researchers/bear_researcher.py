@@ -1,29 +1,21 @@
+from tradingagents.agents.utils.agent_utils import (
+    extract_message_text,
+    render_debate_history,
+    render_research_context,
+)
 from tradingagents.constants import DEFAULT_ASSETS
 
+# 兼容上游状态缺失的情况：辩论状态的默认字段
+_DEBATE_STATE_DEFAULTS = {
+    "history": "",
+    "current_response": "",
+    "count": 0,
+    "last_speaker": "",
+}
 
-def create_bear_researcher(llm):
-    def bear_node(state) -> dict:
-        raw_state = state.get("investment_debate_state") or {}
-        if not isinstance(raw_state, dict):
-            raw_state = {}
-        investment_debate_state = {
-            "history": raw_state.get("history", ""),
-            "current_response": raw_state.get("current_response", ""),
-            "count": raw_state.get("count", 0),
-            "last_speaker": raw_state.get("last_speaker", ""),
-        }
-        history = investment_debate_state.get("history", "")
-
-        current_response = investment_debate_state.get("current_response", "")
-        assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
-        asset_list = ", ".join(assets)
-
-        market_research_report = state["market_report"]
-        newsflash_report = state["newsflash_report"]
-        longform_report = state["longform_report"]
-        positions_info = state.get("current_positions") or "未获取仓位信息"
-
-        prompt = f"""### 角色任务
+# 模块级模板：只承载角色相关的指令与辩论内容；共享的报告前缀由
+# render_research_context 生成并拼接在最前面，以便命中服务端前缀缓存。
+_BEAR_PROMPT_HEAD = """### 角色任务
 你是一名专注加密货币领域的看跌分析师，需要针对以下资产列表提出防御性论点：{asset_list}，并逐条回应看涨分析师：{current_response}
 你必须结合当前持仓信息判断是否需要继续持有、减仓或平仓，并说明理由。
 
@@ -34,54 +26,75 @@ def create_bear_researcher(llm):
 - 给交易员 per-asset 的减仓/观望建议及触发条件。
 - 用单行 JSON 输出，字段固定。
 
-### 研究全文
-- 市场技术分析：{market_research_report}
-- Odaily 快讯：{newsflash_report}
-- 长篇叙事：{longform_report}
-- 当前持仓：{positions_info}
+### 辩论
 - 辩论完整记录：{history}
 
 JSON 结构：
-{{
+"""
+
+# JSON 结构为纯文本常量，直接拼接在模板之后，不参与 format_map 解析。
+_BEAR_JSON_SCHEMA = """{
   "speaker": "bear_researcher",
   "per_asset_warnings": [
-    {{
+    {
       "asset": "symbol",
       "stance": "strong_bear|bear|cautious",
-      "action_plan": {{
+      "action_plan": {
         "recommended_action": "short|hedge|reduce|wait",
         "triggers": ["触发条件"],
         "invalidations": ["失效条件"],
         "hedge_or_reduction": "如何对冲/减仓"
-      }},
-      "risk_summary": {{
+      },
+      "risk_summary": {
         "macro_or_regulatory": ["风险点"],
         "market_structure": ["结构性威胁"],
         "liquidity_or_flow": ["资金流/流动性问题"],
         "narrative_breaks": ["叙事崩塌迹象"]
-      }},
+      },
       "rebuttals": [
-        {{
+        {
           "bull_point": "引用对方观点要点",
           "bear_response": "你的逐条反驳"
-        }}
+        }
       ]
-    }}
+    }
   ],
   "team_message": "留给 Trader 的一句话",
-  "belief_update": {{
+  "belief_update": {
     "probability": 0.0,
     "key_reasons": ["理由1","理由2","理由3"],
     "change_of_mind": ["什么情况下转多"]
-  }}
-}}"""
+  }
+}"""
+
+
+def create_bear_researcher(llm):
+    def bear_node(state) -> dict:
+        raw_state = state.get("investment_debate_state")
+        if not isinstance(raw_state, dict):
+            raw_state = {}
+        # 默认值打底后整体合并，上游新增的字段会原样透传
+        investment_debate_state = {**_DEBATE_STATE_DEFAULTS, **raw_state}
+        history = investment_debate_state["history"]
+        current_response = investment_debate_state["current_response"]
+        assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
+        asset_list = ", ".join(assets)
+
+        role_prompt = _BEAR_PROMPT_HEAD.format_map(
+            {
+                "asset_list": asset_list,
+                "current_response": current_response,
+                "history": render_debate_history(history),
+            }
+        )
+        prompt = f"{render_research_context(state)}\n\n{role_prompt}{_BEAR_JSON_SCHEMA}"
 
         response = llm.invoke(prompt)
-        raw_content = response.content if isinstance(response.content, str) else str(response.content)
 
-        argument = raw_content.strip()
+        argument = extract_message_text(response).strip()
 
         new_investment_debate_state = {
+            **investment_debate_state,
             "history": history + "\n" + argument,
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
@@ -1,30 +1,21 @@
+from tradingagents.agents.utils.agent_utils import (
+    extract_message_text,
+    render_debate_history,
+    render_research_context,
+)
 from tradingagents.constants import DEFAULT_ASSETS
 
+# 兼容上游状态缺失的情况：辩论状态的默认字段
+_DEBATE_STATE_DEFAULTS = {
+    "history": "",
+    "current_response": "",
+    "count": 0,
+    "last_speaker": "",
+}
 
-def create_bull_researcher(llm):
-    def bull_node(state) -> dict:
-        # 兼容上游状态缺失的情况，必要时重新初始化辩论状态
-        raw_state = state.get("investment_debate_state") or {}
-        if not isinstance(raw_state, dict):
-            raw_state = {}
-        investment_debate_state = {
-            "history": raw_state.get("history", ""),
-            "current_response": raw_state.get("current_response", ""),
-            "count": raw_state.get("count", 0),
-            "last_speaker": raw_state.get("last_speaker", ""),
-        }
-        history = investment_debate_state.get("history", "")
-
-        current_response = investment_debate_state.get("current_response", "")
-        assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
-        asset_list = ", ".join(assets)
-
-        market_research_report = state["market_report"]
-        newsflash_report = state["newsflash_report"]
-        longform_report = state["longform_report"]
-        positions_info = state.get("current_positions") or "未获取仓位信息"
-
-        prompt = f"""### 角色任务
+# 模块级模板：只承载角色相关的指令与辩论内容；共享的报告前缀由
+# render_research_context 生成并拼接在最前面，以便命中服务端前缀缓存。
+_BULL_PROMPT_HEAD = """### 角色任务
 你是一名专注加密货币的看涨分析师，需要针对以下资产列表逐一提出进攻性论证：{asset_list}。
 你必须结合当前持仓信息判断是否需要继续持有、加仓、减仓或平仓，并说明理由。
 - 结合市场/快讯/长文中出现的多资产信息，说明每个资产的上行动力、需求增长、生态扩张或可扩展性等正面因素。
@@ -32,52 +23,88 @@ def create_bull_researcher(llm):
 - 给 Trader 清晰的 per-asset 建仓/加仓/减仓/平仓计划，写清触发与终止条件，并明确如何处理已有仓位。
 - 输出单行 JSON，字段固定。
 
-### 研究全文（供引用）
-- 市场技术分析：{market_research_report}
-- Odaily 快讯：{newsflash_report}
-- 长篇叙事：{longform_report}
-- 当前持仓：{positions_info}
+### 辩论
 - 辩论完整记录：{history}
 
 JSON 结构：
-{{
+"""
+
+# 首轮开场：尚无 Bear 观点与辩论记录，省去反驳指令和空的辩论段落。
+_BULL_OPENING_HEAD = """### 角色任务
+你是一名专注加密货币的看涨分析师，需要针对以下资产列表逐一提出进攻性论证：{asset_list}。
+你必须结合当前持仓信息判断是否需要继续持有、加仓、减仓或平仓，并说明理由。
+- 结合市场/快讯/长文中出现的多资产信息，说明每个资产的上行动力、需求增长、生态扩张或可扩展性等正面因素。
+- 这是辩论开场，尚无看跌观点，rebuttals 输出空数组即可。
+- 给 Trader 清晰的 per-asset 建仓/加仓/减仓/平仓计划，写清触发与终止条件，并明确如何处理已有仓位。
+- 输出单行 JSON，字段固定。
+
+JSON 结构：
+"""
+
+# JSON 结构为纯文本常量，直接拼接在模板之后，不参与 format_map 解析。
+_BULL_JSON_SCHEMA = """{
   "speaker": "bull_researcher",
   "per_asset_views": [
-    {{
+    {
       "asset": "symbol",
       "stance": "strong_bull|bull|neutral",
-      "action_plan": {{
+      "action_plan": {
         "recommended_action": "build_long|scale_in|wait",
         "triggers": ["触发条件"],
         "invalidations": ["失效条件"],
         "targets": ["目标区间"]
-      }},
-      "growth_drivers": {{
+      },
+      "growth_drivers": {
         "demand_or_adoption": ["需求/用户/生态扩张证据"],
         "capital_or_flow": ["资金流/链上数据亮点"],
         "narrative_catalysts": ["催化剂或事件"]
-      }},
+      },
       "rebuttals": [
-        {{
+        {
           "bear_point": "引用看跌论点",
           "bull_response": "你的反驳"
-        }}
+        }
       ]
-    }}
+    }
   ],
   "team_message": "给 Trader 的一句话",
-  "belief_update": {{
+  "belief_update": {
     "probability": 0.0,
     "key_reasons": ["理由1","理由2","理由3"],
     "change_of_mind": ["在何种情况下转为空"]
-  }}
-}}"""
+  }
+}"""
+
+
+def create_bull_researcher(llm):
+    def bull_node(state) -> dict:
+        raw_state = state.get("investment_debate_state")
+        if not isinstance(raw_state, dict):
+            raw_state = {}
+        # 默认值打底后整体合并，上游新增的字段会原样透传
+        investment_debate_state = {**_DEBATE_STATE_DEFAULTS, **raw_state}
+        history = investment_debate_state["history"]
+        current_response = investment_debate_state["current_response"]
+        assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
+        asset_list = ", ".join(assets)
+
+        # 开场轮没有可反驳的内容，使用更短的开场模板
+        is_opening = not (history.strip() or current_response)
+        template = _BULL_OPENING_HEAD if is_opening else _BULL_PROMPT_HEAD
+        role_prompt = template.format_map(
+            {
+                "asset_list": asset_list,
+                "current_response": current_response,
+                "history": render_debate_history(history),
+            }
+        )
+        prompt = f"{render_research_context(state)}\n\n{role_prompt}{_BULL_JSON_SCHEMA}"
 
         response = llm.invoke(prompt)
-        raw_content = response.content if isinstance(response.content, str) else str(response.content)
-        argument = raw_content.strip()
+        argument = extract_message_text(response).strip()
 
         new_investment_debate_state = {
+            **investment_debate_state,
             "history": history + "\n" + argument,
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
@@ -1,52 +1,15 @@
-import json
-
-from langchain_core.messages import SystemMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
+from tradingagents.agents.utils.agent_utils import (
+    collect_stream,
+    extract_message_text,
+    render_debate_history,
+)
 from tradingagents.constants import DEFAULT_ASSETS
 
 
-def create_trader(llm, trader_round_store):
-    """
-    Trader node 直接获取持仓信息并生成交易计划，不使用 ToolNode。
-    """
-
-    def trader_node(state):
-        investment_debate_state = state["investment_debate_state"]
-        assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
-        available_capital = state.get("available_capital")
-        capital_hint = (
-            f"{available_capital}" if available_capital is not None else "未知，默认保持轻仓"
-        )
-        min_leverage = state.get("min_leverage")
-        max_leverage = state.get("max_leverage")
-        leverage_hint = (
-            f"{min_leverage}x - {max_leverage}x"
-        )
-        asset_list = ", ".join(assets)
-
-        market_research_report = state["market_report"]
-
-        debate_history = investment_debate_state.get("history", "")
-        positions_info = state.get("current_positions") or "未获取仓位信息"
-
-        recent_rounds = trader_round_store.get_recent_rounds(limit=2)
-        recent_summary = (
-            "\n\n".join(
-                f"[{item.get('created_at')}] {item.get('summary')}" for item in recent_rounds
-            )
-            if recent_rounds
-            else "暂无最近轮次总结。"
-        )
-        open_context = trader_round_store.get_open_position_context()
-        open_context_summary = (
-            open_context.get("summary") if open_context else "暂无未平仓开仓总结。"
-        )
-        open_asset = (
-            str(open_context.get("asset") or "").upper() if open_context else ""
-        )
-
-        system_message = f"""### 角色任务
-你是专业的加密货币合约交易 AI，执行基于“支撑位 + 压力位”的右侧趋势交易系统。资产列表：{asset_list}。每次开仓的本金：{capital_hint}（单笔使用该金额，不允许加仓/补仓），允许杠杆范围：{leverage_hint}。
+_TRADER_SYSTEM_PROMPT = """### 角色任务
+你是专业的加密货币合约交易 AI，执行基于“支撑位 + 压力位”的右侧趋势交易系统。资产列表、每次开仓的本金与允许杠杆范围见用户消息中的“交易约束”（单笔使用该本金，不允许加仓/补仓）。
 
 ### 硬性输出要求（必须遵守）
 1. 只要是 LONG/SHORT 决策，必须在 JSON 的 risk_management.stop_loss_price 与 risk_management.take_profit_price 中给出数值，绝对不允许出现 null。
@@ -93,65 +56,135 @@ def create_trader(llm, trader_round_store):
 4. 给出入场条件、止损价、止盈价与杠杆倍数，并说明信号与结构逻辑（止损/止盈必须落在 risk_management.stop_loss_price 与 risk_management.take_profit_price 字段）。
 5. 输出单行 JSON，字段固定。
 
-### 参考资料
-- 牛熊辩论记录：{debate_history or '暂无辩论记录'}
-- 市场技术报告：{market_research_report}
-- 最近轮次总结：{recent_summary}
-- 未平仓开仓总结：{open_context_summary}
-- 当前持仓：{positions_info}
-
 JSON 结构：
-{{
+{
   "role": "trader",
   "current_positions_summary": "当前持仓摘要（从系统持仓中提取）",
   "per_asset_decisions": [
-    {{
+    {
       "asset": "symbol",
       "existing_position": "当前仓位（若有）",
       "decision": "LONG|SHORT|WAIT|CLOSE_LONG|CLOSE_SHORT",
       "thesis": "一句话概括为何站队多/空",
       "supporting_points": ["引用的关键论据"],
       "discarded_points": ["被舍弃的观点及原因"],
-      "execution": {{
+      "execution": {
           "entry_plan": "当前已满足的入场条件（不满足则说明原因）",
-          "leverage": "选择的整数杠杆（{leverage_hint} 范围内）",
-      }},
-      "risk_management": {{
+          "leverage": "选择的整数杠杆（允许杠杆范围内）",
+      },
+      "risk_management": {
         "invalidations": ["失效条件"],
         "stop_rule": "止损/降仓规则（包含具体价格）",
         "stop_loss_price": "建议的止损价格（USDT，数值，LONG/SHORT 必填，不能为 null）",
         "take_profit_rule": "止盈规则（包含具体价格）",
         "take_profit_price": "止盈价（USDT，数值，LONG/SHORT 必填，不能为 null）",
         "monitoring": ["需要持续跟踪的信号"]
-      }}
+      }
       // 当 decision=WAIT 时，risk_management 结构替换为：
-      "risk_management": {{
+      "risk_management": {
         "monitoring": ["需要持续跟踪的信号"],
         "monitoring_prices": [
-          {{
+          {
             "price": "触发价（数值）",
             "condition": "above|below|touch",
             "note": "触发说明"
-          }}
+          }
         ]
-      }}
-    }}
+      }
+    }
   ],
-}}
+}
 
 """
+
+# 每轮变化的交易约束与参考资料，作为末尾 HumanMessage 的内容
+_TRADER_REFERENCE_TEMPLATE = """### 交易约束
+- 资产列表：{asset_list}
+- 每次开仓的本金：{capital_hint}
+- 允许杠杆范围：{leverage_hint}
+
+### 参考资料
+- 牛熊辩论记录：{debate_history}
+- 市场技术报告：{market_research_report}
+- 最近轮次总结：{recent_summary}
+- 未平仓开仓总结：{open_context_summary}
+- 当前持仓：{positions_info}
+
+请根据资产列表 {asset_list} 给出交易计划。"""
+
+
+def create_trader(llm, trader_round_store, stream: bool = False):
+    """
+    Trader node 直接获取持仓信息并生成交易计划，不使用 ToolNode。
+
+    stream=True 时以流式方式调用 LLM 并在节点内汇总为完整回复。
+    """
+
+    def trader_node(state):
+        investment_debate_state = state["investment_debate_state"]
+        assets = state.get("assets_under_analysis") or list(DEFAULT_ASSETS)
+        available_capital = state.get("available_capital")
+        capital_hint = (
+            f"{available_capital}" if available_capital is not None else "未知，默认保持轻仓"
+        )
+        min_leverage = state.get("min_leverage")
+        max_leverage = state.get("max_leverage")
+        leverage_hint = (
+            f"{min_leverage}x - {max_leverage}x"
+        )
+        asset_list = ", ".join(assets)
+
+        market_research_report = state["market_report"]
+
+        # 与研究员共用同一截断策略：只保留最近的辩论发言，提示长度不随轮数增长
+        debate_history = render_debate_history(investment_debate_state.get("history", ""))
+        positions_info = state.get("current_positions") or "未获取仓位信息"
+
+        recent_rounds = trader_round_store.get_recent_rounds(limit=2)
+        recent_summary = (
+            "\n\n".join(
+                f"[{item.get('created_at')}] {item.get('summary')}" for item in recent_rounds
+            )
+            if recent_rounds
+            else "暂无最近轮次总结。"
+        )
+        open_context = trader_round_store.get_open_position_context()
+        open_context_summary = (
+            open_context.get("summary") if open_context else "暂无未平仓开仓总结。"
+        )
+
+        # 资金/杠杆约束与每轮变化的参考资料都放在末尾的 HumanMessage 中，
+        # system prompt 为模块级常量，请求前缀在各轮之间逐字节一致，便于服务端前缀缓存命中。
+        reference_message = _TRADER_REFERENCE_TEMPLATE.format_map(
+            {
+                "asset_list": asset_list,
+                "capital_hint": capital_hint,
+                "leverage_hint": leverage_hint,
+                "debate_history": debate_history or "暂无辩论记录",
+                "market_research_report": market_research_report,
+                "recent_summary": recent_summary,
+                "open_context_summary": open_context_summary,
+                "positions_info": positions_info,
+            }
+        )
+
         conversation = list(state["messages"])
-        conversation.append(("human", f"请根据资产列表 {asset_list} 给出交易计划。"))
+        conversation.append(HumanMessage(content=reference_message))
 
-        response = llm.invoke([SystemMessage(content=system_message)] + conversation)
-        plan_text = response.content if isinstance(response.content, str) else str(response.content)
-        combined_plan = plan_text.strip()
+        prompt_messages = [SystemMessage(content=_TRADER_SYSTEM_PROMPT)] + conversation
+        if stream:
+            response = collect_stream(llm, prompt_messages)
+        else:
+            response = llm.invoke(prompt_messages)
+        combined_plan = extract_message_text(response).strip()
 
         current_round = int(state.get("interaction_round", 1))
         next_round = current_round + 1
 
-        updated_invest_state = dict(investment_debate_state)
-        updated_invest_state["current_response"] = combined_plan
+        updated_invest_state = {
+            **investment_debate_state,
+            "current_response": combined_plan,
+        }
 
         return {
             "messages": [response],
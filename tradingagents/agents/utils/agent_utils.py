@@ -1,4 +1,7 @@
-from langchain_core.messages import HumanMessage, RemoveMessage
+import re
+from typing import Any
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage
 from langgraph.graph.message import REMOVE_ALL_MESSAGES
 
 from tradingagents.agents.utils.crypto_market_tools import (
@@ -11,6 +14,111 @@ from tradingagents.agents.utils.news_data_tools import (
     get_crypto_newsflash_candidates,
     get_crypto_newsflash_content,
 )
+
+# 牛熊双方共用的研究资料块。放在 prompt 最前面且逐字节一致，
+# 同一轮内第二位发言者即可命中 DeepSeek/OpenAI 的自动前缀缓存。
+_RESEARCH_CONTEXT_TEMPLATE = """### 研究全文（供引用）
+- 市场技术分析：{market_report}
+- Odaily 快讯：{newsflash_report}
+- 长篇叙事：{longform_report}
+- 当前持仓：{positions_info}"""
+
+# 写入 prompt 的辩论记录字符预算；完整记录仍保留在 state 中供 Trace 展示。
+DEBATE_HISTORY_PROMPT_LIMIT = 6000
+
+
+def extract_message_text(message: Any) -> str:
+    """Best-effort extraction of plain text from a LangChain message.
+
+    字符串内容（绝大多数 OpenAI 兼容模型）直接返回；Gemini 等返回的分段列表
+    逐段拼接，避免 str(list) 把结构体原样写进报告。
+    """
+    if message is None:
+        return ""
+
+    content = getattr(message, "content", message)
+
+    if isinstance(content, str):
+        return content
+
+    if isinstance(content, list):
+        parts = []
+        for chunk in content:
+            if isinstance(chunk, str):
+                parts.append(chunk)
+            elif isinstance(chunk, dict):
+                text = (
+                    chunk.get("text")
+                    or chunk.get("content")
+                    or ""
+                )
+                if text:
+                    parts.append(str(text))
+            else:
+                parts.append(str(chunk))
+        return "\n".join(parts)
+
+    return str(content)
+
+
+def collect_stream(llm: Any, messages: Any) -> AIMessage:
+    """以流式方式调用 LLM，并把增量片段汇总为一条完整的 AIMessage。
+
+    片段先收集到列表中、最后一次性 join，避免逐块 ``+=`` 拼接带来的二次复杂度。
+    """
+    parts: list[str] = []
+    last_chunk = None
+    for chunk in llm.stream(messages):
+        text = extract_message_text(chunk)
+        if text:
+            parts.append(text)
+        last_chunk = chunk
+    if last_chunk is None:
+        return AIMessage(content="")
+    return AIMessage(
+        content="".join(parts),
+        id=getattr(last_chunk, "id", None),
+        response_metadata=dict(getattr(last_chunk, "response_metadata", None) or {}),
+        usage_metadata=getattr(last_chunk, "usage_metadata", None),
+    )
+
+
+# 辩论发言的起始位置：bull/bear 每轮输出一个以 "speaker" 字段开头的 JSON 对象
+# （可能带 ```json 代码块标记），发言之间以换行拼接。发言内部可能含换行，
+# 因此只能以该标记作为轮次边界。
+_DEBATE_TURN_START_RE = re.compile(r'\n(?=(?:```(?:json)?\s*)?\{\s*"speaker"\s*:)')
+
+
+def render_debate_history(history: str, limit: int = DEBATE_HISTORY_PROMPT_LIMIT) -> str:
+    """按字符预算保留最近的辩论发言，更早的部分以占位提示代替。"""
+    text = (history or "").strip()
+    if len(text) <= limit:
+        return text
+    tail = text[-limit:]
+    # 从预算窗口内的第一个完整发言开始截取，避免把某轮发言切成半截；
+    # 窗口内没有发言边界（单轮发言超长）时退回到按行截取
+    match = _DEBATE_TURN_START_RE.search(tail)
+    if match:
+        tail = tail[match.end() :]
+    else:
+        cut = tail.find("\n")
+        if 0 <= cut < len(tail) - 1:
+            tail = tail[cut + 1 :]
+    return "[较早的辩论记录已省略]\n" + tail
+
+
+def render_research_context(state) -> str:
+    """渲染研究员共享的报告前缀（只依赖本轮不变的报告与持仓）。"""
+    return _RESEARCH_CONTEXT_TEMPLATE.format_map(
+        {
+            "market_report": state["market_report"],
+            "newsflash_report": state["newsflash_report"],
+            "longform_report": state["longform_report"],
+            "positions_info": state.get("current_positions") or "未获取仓位信息",
+        }
+    )
+
+
 def create_msg_delete():
     def delete_messages(state):
         """Clear all messages atomically and insert a placeholder."""
@@ -1,5 +1,8 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Annotated, Callable, Sequence, Tuple
+
 from langchain_core.tools import tool
-from typing import Annotated, List
 
 from tradingagents.dataflows.binance import (
     get_market_snapshot,
@@ -7,16 +10,35 @@ from tradingagents.dataflows.binance import (
 )
 
 
-def _parse_symbol_list(raw: str) -> List[str]:
-    """Parse comma/newline separated symbols into a clean uppercase list."""
+@functools.lru_cache(maxsize=256)
+def _parse_symbol_list(raw: str) -> Tuple[str, ...]:
+    """Parse comma/newline separated symbols into a clean uppercase tuple (cached per raw string)."""
     if not raw:
-        return []
+        return ()
     normalized = raw.replace("\n", ",")
-    return [
+    return tuple(
         token.strip().upper()
         for token in normalized.split(",")
         if token.strip()
-    ]
+    )
+
+
+# 批量工具的并发上限；每个 symbol 的读取/计算彼此独立
+_BATCH_MAX_WORKERS = 8
+
+
+def _run_per_symbol(
+    func: Callable[..., str], symbol_list: Sequence[str], interval: str, limit: int
+) -> str:
+    """并发执行逐 symbol 的查询，按输入顺序拼接为 === SYMBOL === 分段。"""
+    def _one(symbol: str) -> str:
+        return f"=== {symbol} ===\n{func(symbol, interval=interval, limit=limit)}"
+
+    if len(symbol_list) == 1:
+        return _one(symbol_list[0])
+    workers = min(len(symbol_list), _BATCH_MAX_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return "\n\n".join(executor.map(_one, symbol_list))
 
 
 @tool
@@ -32,11 +54,7 @@ def get_crypto_market_batch(
     if not symbol_list:
         return "No valid Binance symbols were provided."
 
-    chunks: List[str] = []
-    for symbol in symbol_list:
-        snapshot = get_market_snapshot(symbol, interval=interval, limit=limit)
-        chunks.append(f"=== {symbol} ===\n{snapshot}")
-    return "\n\n".join(chunks)
+    return _run_per_symbol(get_market_snapshot, symbol_list, interval, limit)
 
 
 @tool
@@ -50,8 +68,4 @@ def get_support_resistance_batch(
     if not symbol_list:
         return "No valid Binance symbols were provided for support/resistance."
 
-    chunks: List[str] = []
-    for symbol in symbol_list:
-        sr = analyze_support_resistance(symbol, interval=interval, limit=limit)
-        chunks.append(f"=== {symbol} ===\n{sr}")
-    return "\n\n".join(chunks)
+    return _run_per_symbol(analyze_support_resistance, symbol_list, interval, limit)
@@ -0,0 +1,52 @@
+"""JSON 序列化/解析的公共工具：优先使用 orjson，缺失时回退到标准库 json。"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson 为可选加速依赖，缺失时回退到标准库 json
+    orjson = None
+
+# 紧凑分隔符：去掉 ", " / ": " 中的空格，与 orjson 的输出格式保持一致。
+_COMPACT_SEPARATORS = (",", ":")
+
+
+def json_loads(text: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def json_dumps(obj: Any) -> str:
+    """紧凑、保留非 ASCII 字符的序列化；orjson 无法处理的对象回退到标准库。"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=_COMPACT_SEPARATORS)
+
+
+def extract_json_object(text: Any) -> Optional[Dict[str, Any]]:
+    """从 LLM 输出中提取最外层 JSON 对象，解析失败返回 None。
+
+    直接定位首尾花括号并只解析一次；纯 JSON 输出时切片即为原文。
+    """
+    if isinstance(text, dict):
+        return text
+    if not text:
+        return None
+    if not isinstance(text, str):
+        text = str(text)
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        parsed = json_loads(text[start : end + 1])
+    except Exception:
+        return None
+    return parsed if isinstance(parsed, dict) else None
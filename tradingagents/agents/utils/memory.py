@@ -1,9 +1,15 @@
 import hashlib
 import logging
 import os
-import random
-from math import sqrt
+import sqlite3
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, cast, List, Literal
+
+import numpy as np
 from dotenv import load_dotenv
 
 try:
@@ -20,6 +26,118 @@ from openai import OpenAIError
 
 logger = logging.getLogger(__name__)
 
+# DashScope text-embedding-v4 单次请求最多 10 条输入
+_EMBEDDING_BATCH_SIZE = 10
+
+# 远程 embedding 熔断：连续失败达到阈值后断开，冷却后放行一次探测请求
+_EMBEDDING_BREAKER_THRESHOLD = 3
+_EMBEDDING_BREAKER_COOLDOWN = 60
+
+# 无法从 Chroma 客户端获取批量上限时，单次 collection.add 的条数
+_DEFAULT_ADD_BATCH_SIZE = 512
+
+# 进程内 embedding LRU 的容量（按文本条数计）
+_EMBEDDING_MEMORY_CACHE_SIZE = 256
+
+# 新建 collection 时使用的 HNSW 索引参数。已有 collection 保持创建时的距离空间，
+# get_memories 按实际空间计算 similarity_score，见其 docstring。
+_HNSW_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:M": 16,
+    "hnsw:construction_ef": 100,
+    "hnsw:search_ef": 64,
+}
+
+# collection.get / query 的 include 字段在模块级固定，避免每次调用重新构造；
+# Chroma 的 validate_include 只接受 list，因此保持 list 类型且不要原地修改。
+_INCLUDE_ENTRIES: List[Literal["metadatas", "documents"]] = ["metadatas", "documents"]
+_INCLUDE_QUERY: List[Literal["metadatas", "documents", "distances"]] = [
+    "metadatas",
+    "documents",
+    "distances",
+]
+# 非 cosine 空间（旧的 L2 collection）需要取回向量，直接计算余弦相似度
+_INCLUDE_QUERY_WITH_EMBEDDINGS: List[
+    Literal["metadatas", "documents", "distances", "embeddings"]
+] = ["metadatas", "documents", "distances", "embeddings"]
+
+
+def _cosine_similarities(query, vectors) -> List[float]:
+    """query 与每个候选向量的余弦相似度；零向量的相似度记为 0。"""
+    q = np.asarray(query, dtype=np.float32)
+    m = np.asarray(vectors, dtype=np.float32).reshape(-1, q.shape[0])
+    norms = np.linalg.norm(m, axis=1) * np.linalg.norm(q)
+    dots = m @ q
+    sims = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+    return sims.tolist()
+
+
+def _l2_normalize(vector) -> List[float]:
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(arr)
+    if norm:
+        arr = arr / norm
+    return arr.tolist()
+
+
+class _EmbeddingDiskCache:
+    """远程 embedding 的磁盘缓存：key 为 blake2b(model \\0 text)，向量以 float32 存储。
+
+    只缓存远程服务返回的向量；本地降级向量不落盘，远程恢复后仍会重新获取。
+    """
+
+    # SQLite 单条语句的绑定参数上限较保守地取 500
+    _QUERY_CHUNK = 500
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS emb (key BLOB PRIMARY KEY, vec BLOB NOT NULL)"
+            )
+
+    @staticmethod
+    def _key(model: str, text: str) -> bytes:
+        return hashlib.blake2b(
+            f"{model}\0{text}".encode("utf-8"), digest_size=16
+        ).digest()
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        key_to_text = {self._key(model, text): text for text in texts}
+        keys = list(key_to_text)
+        found: Dict[str, List[float]] = {}
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                for start in range(0, len(keys), self._QUERY_CHUNK):
+                    chunk = keys[start : start + self._QUERY_CHUNK]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(
+                        f"SELECT key, vec FROM emb WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key_to_text[key]] = np.frombuffer(
+                            blob, dtype=np.float32
+                        ).tolist()
+        except sqlite3.Error as exc:
+            logger.warning("读取 embedding 磁盘缓存失败: %s", exc)
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        rows = [
+            (self._key(model, text), np.asarray(vector, dtype=np.float32).tobytes())
+            for text, vector in items.items()
+        ]
+        if not rows:
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO emb (key, vec) VALUES (?, ?)", rows
+                )
+        except sqlite3.Error as exc:
+            logger.warning("写入 embedding 磁盘缓存失败: %s", exc)
+
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
@@ -48,8 +166,19 @@ class FinancialSituationMemory:
         self.situation_collection: Any = None
         self.chroma_client: Any = None
         self._fallback_dim = 256
-        self._remote_embeddings_enabled = self.client is not None
+        self._breaker_lock = threading.Lock()
+        self._breaker_failures = 0
+        self._breaker_opened_at: Any = None
         self._max_remote_input_len = 8192
+        self._embed_concurrency = max(1, int(os.getenv("DASHSCOPE_EMBED_CONCURRENCY", "4")))
+        # 多批次 embedding 请求共用一个线程池（线程按需创建），避免每次调用重建
+        self._embed_executor = (
+            ThreadPoolExecutor(
+                max_workers=self._embed_concurrency, thread_name_prefix="embedding"
+            )
+            if self._embed_concurrency > 1
+            else None
+        )
 
         use_chroma = config.get("use_chroma_memory", True)
         chroma_path = config.get("chroma_path") or os.path.join(
@@ -64,81 +193,218 @@ class FinancialSituationMemory:
         os.makedirs(chroma_path, exist_ok=True)
         self.chroma_client = chromadb.PersistentClient(
             path=chroma_path,
-            settings=Settings(allow_reset=True),
-        )
-        self.situation_collection = self.chroma_client.get_or_create_collection(
-            name=name
+            settings=Settings(allow_reset=True, anonymized_telemetry=False),
         )
+        self.situation_collection = self._open_collection(name)
         if self.situation_collection is None:
             raise RuntimeError("Chroma collection 初始化失败。")
+        # 旧 collection 可能是 L2 空间且存有未归一化的向量，此时 1 - distance 不是相似度
+        collection_metadata = getattr(self.situation_collection, "metadata", None) or {}
+        self._cosine_space = (
+            str(collection_metadata.get("hnsw:space") or "l2").lower() == "cosine"
+        )
 
-    def get_embedding(self, text):
-        """获取文本的 embedding，用远程服务失败时自动降级为本地 hash 向量。"""
+        self._memory_cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._memory_cache_lock = threading.Lock()
+
+        self._disk_cache: Any = None
+        if config.get("embedding_disk_cache", True):
+            try:
+                self._disk_cache = _EmbeddingDiskCache(
+                    os.path.join(chroma_path, "embedding_cache.db")
+                )
+            except sqlite3.Error as exc:
+                logger.warning("embedding 磁盘缓存不可用，将直接请求远程服务: %s", exc)
+
+    def _open_collection(self, name):
+        """打开已有 collection；不存在时按 _HNSW_COLLECTION_METADATA 新建。
+
+        HNSW 参数只能在创建时设定，已有 collection 保持原配置不变。
+        """
+        client = cast(Any, self.chroma_client)
+        try:
+            return client.get_collection(name=name)
+        except Exception:
+            return client.get_or_create_collection(
+                name=name, metadata=dict(_HNSW_COLLECTION_METADATA)
+            )
+
+    def _clean_text(self, text) -> str:
         clean_text = (text or "").strip()
         if not clean_text:
-            clean_text = "空上下文，无可供嵌入的有效内容。"
-        elif len(clean_text) > self._max_remote_input_len:
+            return "空上下文，无可供嵌入的有效内容。"
+        if len(clean_text) > self._max_remote_input_len:
             logger.warning(
                 "嵌入文本长度超出 %d 字符，已自动截断以适配 DashScope 限制。",
                 self._max_remote_input_len,
             )
             clean_text = clean_text[: self._max_remote_input_len]
+        return clean_text
+
+    def _remote_available(self) -> bool:
+        """熔断器：断开期间直接走本地降级；冷却期结束后放行一次探测请求（half-open）。"""
+        if self.client is None:
+            return False
+        with self._breaker_lock:
+            if self._breaker_opened_at is None:
+                return True
+            if time.monotonic() - self._breaker_opened_at < _EMBEDDING_BREAKER_COOLDOWN:
+                return False
+            # 进入 half-open：重置计时，期间其他请求继续降级，直到探测结果返回
+            self._breaker_opened_at = time.monotonic()
+            logger.info("embedding 熔断冷却结束，尝试恢复远程服务。")
+            return True
+
+    def _record_remote_result(self, success: bool) -> None:
+        with self._breaker_lock:
+            if success:
+                if self._breaker_opened_at is not None:
+                    logger.warning("远程 embedding 已恢复，关闭熔断。")
+                self._breaker_failures = 0
+                self._breaker_opened_at = None
+                return
+            self._breaker_failures += 1
+            if (
+                self._breaker_opened_at is not None
+                or self._breaker_failures >= _EMBEDDING_BREAKER_THRESHOLD
+            ):
+                if self._breaker_opened_at is None:
+                    logger.warning(
+                        "远程 embedding 连续失败 %d 次，熔断 %d 秒，期间使用本地降级方案。",
+                        self._breaker_failures,
+                        _EMBEDDING_BREAKER_COOLDOWN,
+                    )
+                self._breaker_opened_at = time.monotonic()
+
+    def _request_embeddings(self, texts: List[str]):
+        """调用远程 embedding 服务；失败时计入熔断器并返回 None。"""
+        if not self._remote_available():
+            return None
+        try:
+            response = self.client.embeddings.create(model=self.embedding, input=texts)
+            # 按 index 还原输入顺序
+            data = sorted(response.data, key=lambda item: item.index)
+            embeddings = [item.embedding for item in data]
+        except OpenAIError as exc:
+            logger.warning(
+                "远程 embedding 失败 (%s)，自动降级为本地 hash 向量。", exc
+            )
+        except Exception as exc:  # pragma: no cover - network/runtime issues
+            logger.warning(
+                "调用 embedding 服务异常 (%s)，将使用本地降级方案。",
+                exc,
+            )
+        else:
+            self._record_remote_result(True)
+            return embeddings
+        self._record_remote_result(False)
+        return None
 
-        if self._remote_embeddings_enabled and self.client is not None:
-            try:
-                response = self.client.embeddings.create(
-                    model=self.embedding, input=clean_text
-                )
-                return response.data[0].embedding
-            except OpenAIError as exc:
-                logger.warning(
-                    "远程 embedding 失败 (%s)，自动降级为本地 hash 向量。", exc
-                )
-                self._remote_embeddings_enabled = False
-            except Exception as exc:  # pragma: no cover - network/runtime issues
-                logger.warning(
-                    "调用 embedding 服务异常 (%s)，将使用本地降级方案。",
-                    exc,
-                )
-                self._remote_embeddings_enabled = False
-
-        return self._fallback_embedding(clean_text)
+    def get_embedding(self, text):
+        """获取文本的 embedding，用远程服务失败时自动降级为本地 hash 向量。"""
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """批量获取 embedding：先查磁盘缓存，未命中的文本按服务端批量上限分批请求，
+        失败的批次逐条降级。"""
+        clean_texts = [self._clean_text(text) for text in texts]
+        resolved = self._memory_cache_get(clean_texts)
+        if self._disk_cache is not None and len(resolved) < len(clean_texts):
+            missing = [text for text in clean_texts if text not in resolved]
+            from_disk = self._disk_cache.get_many(self.embedding, missing)
+            self._memory_cache_put(from_disk)
+            resolved.update(from_disk)
+        # 去重后只请求未命中的文本
+        pending = [text for text in dict.fromkeys(clean_texts) if text not in resolved]
+        batches = [
+            pending[start : start + _EMBEDDING_BATCH_SIZE]
+            for start in range(0, len(pending), _EMBEDDING_BATCH_SIZE)
+        ]
+        if len(batches) > 1 and self._embed_executor is not None:
+            # 多个子批次并发请求（I/O 密集，等待网络时释放 GIL）
+            responses = list(self._embed_executor.map(self._request_embeddings, batches))
+        else:
+            responses = [self._request_embeddings(batch) for batch in batches]
+        for batch, remote in zip(batches, responses):
+            if remote and len(remote) == len(batch):
+                # 统一归一化为单位向量后再入缓存/入库，与 cosine 索引保持一致
+                fetched = {
+                    text: _l2_normalize(vector) for text, vector in zip(batch, remote)
+                }
+                if self._disk_cache is not None:
+                    self._disk_cache.put_many(self.embedding, fetched)
+                self._memory_cache_put(fetched)
+                resolved.update(fetched)
+            else:
+                resolved.update((text, self._fallback_embedding(text)) for text in batch)
+        return [resolved[text] for text in clean_texts]
+
+    def _memory_cache_get(self, texts: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._memory_cache_lock:
+            for text in texts:
+                vector = self._memory_cache.get(text)
+                if vector is None:
+                    continue
+                self._memory_cache.move_to_end(text)
+                found[text] = vector
+        return found
+
+    def _memory_cache_put(self, items: Dict[str, List[float]]) -> None:
+        with self._memory_cache_lock:
+            for text, vector in items.items():
+                self._memory_cache[text] = vector
+                self._memory_cache.move_to_end(text)
+            while len(self._memory_cache) > _EMBEDDING_MEMORY_CACHE_SIZE:
+                self._memory_cache.popitem(last=False)
 
     def _fallback_embedding(self, text: str):
-        """使用确定性的 hash 方法生成向量，避免依赖外部额度。"""
-        vector = [0.0] * self._fallback_dim
-        tokens = [tok for tok in text.lower().split() if tok]
-        if not tokens:
-            return vector
-
-        for token in tokens:
-            seed = int(hashlib.md5(token.encode("utf-8")).hexdigest(), 16)
-            rng = random.Random(seed)
-            weight = 1.0
-            for idx in range(self._fallback_dim):
-                vector[idx] += weight * (rng.random() * 2 - 1)
-
-        norm = sqrt(sum(val * val for val in vector))
+        """使用确定性的 SimHash 投影生成向量，避免依赖外部额度。
+
+        每个 token 的 blake2b 摘要按位展开为 ±1 向量，按出现次数加权求和后归一化。
+        """
+        # str.split() 无分隔符时不会产生空 token，无需再过滤
+        token_counts = Counter(text.lower().split())
+        if not token_counts:
+            return [0.0] * self._fallback_dim
+
+        digest_size = (self._fallback_dim + 7) // 8
+        digests = b"".join(
+            hashlib.blake2b(token.encode("utf-8"), digest_size=digest_size).digest()
+            for token in token_counts
+        )
+        bits = np.unpackbits(
+            np.frombuffer(digests, dtype=np.uint8).reshape(len(token_counts), digest_size),
+            axis=1,
+        )[:, : self._fallback_dim]
+        signs = bits.astype(np.float32) * 2 - 1
+        counts = np.fromiter(token_counts.values(), dtype=np.float32, count=len(token_counts))
+        vector = counts @ signs
+
+        norm = np.linalg.norm(vector)
         if norm:
-            vector = [val / norm for val in vector]
-        return vector
+            vector /= norm
+        return vector.tolist()
+
+    def add_situations(self, situations_and_advice, metadata_list=None, batch_size=None):
+        """新增情景与建议。参数为 [(situation, recommendation), ...] 列表。
 
-    def add_situations(self, situations_and_advice, metadata_list=None):
-        """新增情景与建议。参数为 [(situation, recommendation), ...] 列表。"""
+        写入 Chroma 时按 batch_size 分批（默认取客户端允许的最大批量），
+        大批量回放不会超出单次 add 的上限。
+        id 使用 uuid4，不再按写入顺序递增，多个进程/线程可并发写入而无需协调偏移量。
+        """
 
         situations = []
         advice = []
         ids = []
-        embeddings = []
 
         collection = cast(Any, self.situation_collection)
-        offset = collection.count()
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
+        for situation, recommendation in situations_and_advice:
             situations.append(situation)
             advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+            ids.append(uuid.uuid4().hex)
+        embeddings = self.get_embeddings(situations)
 
         metadatas = []
         for idx, rec in enumerate(advice):
@@ -148,46 +414,42 @@ class FinancialSituationMemory:
                 base_meta.update(extra)
             metadatas.append(base_meta)
 
-        collection.add(
-            documents=situations,
-            metadatas=metadatas,
-            embeddings=embeddings,
-            ids=ids,
-        )
+        step = batch_size or self._max_add_batch_size()
+        for start in range(0, len(ids), step):
+            end = start + step
+            collection.add(
+                documents=situations[start:end],
+                metadatas=metadatas[start:end],
+                embeddings=embeddings[start:end],
+                ids=ids[start:end],
+            )
+
+    def _max_add_batch_size(self) -> int:
+        client = cast(Any, self.chroma_client)
+        try:
+            return int(client.get_max_batch_size()) or _DEFAULT_ADD_BATCH_SIZE
+        except Exception:
+            return _DEFAULT_ADD_BATCH_SIZE
 
     def get_entries(self, where=None, limit=None):
         """按 metadata 过滤原始条目，返回 [{id, document, metadata}, ...]。"""
         collection = cast(Any, self.situation_collection)
-        include_typed: List[Literal["metadatas", "documents"]] = [
-            "metadatas",
-            "documents",
-        ]
-        raw = collection.get(where=where, limit=limit, include=include_typed)
+        raw = collection.get(where=where, limit=limit, include=_INCLUDE_ENTRIES)
         ids = raw.get("ids") or []
         documents = raw.get("documents") or []
         metadatas = raw.get("metadatas") or []
 
-        entries = []
-        # Chroma 返回 list 或 list of list
+        # Chroma 返回 list 或 list of list：先统一拍平一次，再用 zip 按最短长度对齐
         if documents and isinstance(documents[0], list):
-            doc_iter = documents[0]
-            meta_iter = metadatas[0] if metadatas else []
-            id_iter = raw.get("ids", [])[0] if ids and isinstance(ids[0], list) else ids
-        else:
-            doc_iter = documents
-            meta_iter = metadatas
-            id_iter = ids
-
-        count = min(len(doc_iter), len(meta_iter), len(id_iter))
-        for idx in range(count):
-            entries.append(
-                {
-                    "id": id_iter[idx],
-                    "document": doc_iter[idx],
-                    "metadata": meta_iter[idx],
-                }
-            )
-        return entries
+            documents = documents[0]
+            metadatas = metadatas[0] if metadatas else []
+        if ids and isinstance(ids[0], list):
+            ids = ids[0]
+
+        return [
+            {"id": entry_id, "document": document, "metadata": metadata}
+            for entry_id, document, metadata in zip(ids, documents, metadatas)
+        ]
 
     def delete_entries(self, ids=None, where=None):
         """根据 id 或 metadata 条件删除条目。"""
@@ -202,19 +464,18 @@ class FinancialSituationMemory:
         collection.delete(**delete_kwargs)
 
     def get_memories(self, current_situation, n_matches=1):
-        """根据当前情景查找最相似的历史建议。"""
+        """根据当前情景查找最相似的历史建议。
+
+        similarity_score 统一为余弦相似度：cosine 空间的 collection 直接取 1 - distance；
+        其他空间（旧的 L2 collection，其中的向量不保证为单位向量）取回候选向量后计算。
+        """
         query_embedding = self.get_embedding(current_situation)
 
         collection = cast(Any, self.situation_collection)
-        include_query: List[Literal["metadatas", "documents", "distances"]] = [
-            "metadatas",
-            "documents",
-            "distances",
-        ]
         results = collection.query(
             query_embeddings=[query_embedding],
             n_results=n_matches,
-            include=include_query,
+            include=_INCLUDE_QUERY if self._cosine_space else _INCLUDE_QUERY_WITH_EMBEDDINGS,
         )
 
         matched_results = []
@@ -225,14 +486,21 @@ class FinancialSituationMemory:
         if not documents or not documents[0]:
             return matched_results
 
-        count = min(len(documents[0]), len(metadatas[0]), len(distances[0]))
+        if self._cosine_space:
+            scores = [1 - distance for distance in distances[0]]
+        else:
+            embeddings = results.get("embeddings")
+            if embeddings is None or len(embeddings) == 0 or len(embeddings[0]) == 0:
+                scores = []
+            else:
+                scores = _cosine_similarities(query_embedding, embeddings[0])
 
-        for i in range(count):
+        for document, metadata, score in zip(documents[0], metadatas[0], scores):
             matched_results.append(
                 {
-                    "matched_situation": documents[0][i],
-                    "recommendation": metadatas[0][i]["recommendation"],
-                    "similarity_score": 1 - distances[0][i],
+                    "matched_situation": document,
+                    "recommendation": metadata["recommendation"],
+                    "similarity_score": score,
                 }
             )
 
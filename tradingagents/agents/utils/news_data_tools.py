@@ -1,38 +1,63 @@
+from itertools import chain
 from langchain_core.tools import tool
 import re
-from typing import Annotated, List, Dict
+from typing import Annotated, Any, Dict, List
 from tradingagents.dataflows.odaily import (
     get_newsflash_candidates,
-    get_newsflash_content_by_id,
+    get_newsflash_content_by_ids,
     get_article_content_by_id,
     get_article_candidates,
 )
 
 
+# 模块级预编译：ID 分隔符（逗号/换行）与数字 ID
+_SPLIT_RE = re.compile(r"[,\n]")
+_ID_RE = re.compile(r"\d+")
+
+
 def _parse_entry_ids(raw: str) -> List[str]:
     """规范化逗号/换行分隔的 entry ID。"""
     if not raw:
         return []
-    normalized = raw.replace("\n", ",")
     parsed: List[str] = []
-    for token in normalized.split(","):
+    for token in _SPLIT_RE.split(raw):
         candidate = token.strip()
         if not candidate:
             continue
         # 允许 "ID=123" 或 URL 末尾带数字等格式
         if "=" in candidate:
             candidate = candidate.split("=", 1)[1].strip()
-        last_segment = candidate.split("/")[-1].strip()
-        last_segment = last_segment.rstrip(")., ")
-        if last_segment.isdigit():
-            parsed.append(last_segment)
-            continue
-        match = re.search(r"(\d+)", last_segment)
+        last_segment = candidate.rsplit("/", 1)[-1].strip().rstrip(")., ")
+        match = _ID_RE.search(last_segment)
         if match:
-            parsed.append(match.group(1))
+            parsed.append(match.group(0))
     return parsed
 
 
+def _format_candidates(header: str, entries: List[Dict[str, Any]]) -> str:
+    """候选标题列表：表头 + 逐条 "序号. ID=... | Title: ..."，一次 join 拼接。"""
+    return "\n".join(
+        chain(
+            (header,),
+            (
+                f"{idx}. ID={entry['entry_id']} | Title: {entry['title']}"
+                for idx, entry in enumerate(entries, 1)
+            ),
+        )
+    )
+
+
+def _format_entry_content(entry: Dict[str, Any]) -> str:
+    """快讯/长文正文的统一展示格式（标题、ID、发布时间、摘要）。"""
+    get = entry.get
+    return (
+        f"Title: {get('title') or ''}\n"
+        f"Entry ID: {get('entry_id')}\n"
+        f"Published: {get('published') or 'Unknown'}\n\n"
+        f"Summary: {get('summary') or ''}"
+    )
+
+
 @tool
 def get_crypto_newsflash_candidates(
     limit: Annotated[int, "返回标题数量"] = 40,
@@ -44,10 +69,7 @@ def get_crypto_newsflash_candidates(
     entries = get_newsflash_candidates(limit=limit, lookback_hours=lookback_hours)
     if not entries:
         return "No recent news flashes available."
-    lines = ["Recent Odaily news flashes (ID + Title):"]
-    for idx, entry in enumerate(entries, 1):
-        lines.append(f"{idx}. ID={entry['entry_id']} | Title: {entry['title']}")
-    return "\n".join(lines)
+    return _format_candidates("Recent Odaily news flashes (ID + Title):", entries)
 
 
 @tool
@@ -57,25 +79,19 @@ def get_crypto_newsflash_content(
     """
     根据 entry_id 列表获取 Odaily 快讯的关键字段（标题、摘要、发布时间）。
     """
-    parsed_ids = _parse_entry_ids(entry_ids)
+    # 去重（保持顺序）后一次批量查询
+    parsed_ids = list(dict.fromkeys(_parse_entry_ids(entry_ids)))
     if not parsed_ids:
         return "No valid entry IDs were provided."
 
+    records = get_newsflash_content_by_ids(parsed_ids)
     chunks: List[str] = []
     for entry_id in parsed_ids:
-        newsflash = get_newsflash_content_by_id(entry_id)
+        newsflash = records.get(entry_id)
         if not newsflash:
             chunks.append(f"Entry ID {entry_id}: not found.")
             continue
-        published = newsflash.get("published") or "Unknown"
-        summary = newsflash.get("summary") or ""
-        title = newsflash.get("title") or ""
-        chunks.append(
-            f"Title: {title}\n"
-            f"Entry ID: {newsflash.get('entry_id')}\n"
-            f"Published: {published}\n\n"
-            f"Summary: {summary}"
-        )
+        chunks.append(_format_entry_content(newsflash))
 
     return "\n\n".join(chunks)
 
@@ -91,10 +107,7 @@ def get_crypto_longform_candidates(
     entries = get_article_candidates(limit=limit, lookback_days=lookback_days)
     if not entries:
         return "No recent long-form articles available."
-    lines = ["Recent Odaily long-form articles (ID + Title):"]
-    for idx, entry in enumerate(entries, 1):
-        lines.append(f"{idx}. ID={entry['entry_id']} | Title: {entry['title']}")
-    return "\n".join(lines)
+    return _format_candidates("Recent Odaily long-form articles (ID + Title):", entries)
 
 
 @tool
@@ -107,12 +120,4 @@ def get_crypto_article_content(
     article = get_article_content_by_id(entry_id)
     if not article:
         return f"No article found for entry_id={entry_id}"
-    published = article.get("published") or "Unknown"
-    summary = article.get("summary") or ""
-    title = article.get("title") or ""
-    return (
-        f"Title: {title}\n"
-        f"Entry ID: {article.get('entry_id')}\n"
-        f"Published: {published}\n\n"
-        f"Summary: {summary}"
-    )
+    return _format_entry_content(article)
@@ -7,10 +7,13 @@ basic technical indicators without relying on legacy equity vendors.
 
 from __future__ import annotations
 
+import functools
 import math
 import sqlite3
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import pandas as pd
 from scipy.signal import find_peaks
@@ -50,6 +53,42 @@ INTERVAL_TABLE_MAP = {
 ALL_KLINE_TABLES = {DEFAULT_KLINES_TABLE}
 ALL_KLINE_TABLES.update(INTERVAL_TABLE_MAP.values())
 
+# 行情文本的进程内 TTL 缓存：同一轮分析中多个工具调用常请求相同的
+# (symbol, interval, limit)，在有效期内直接复用结果，避免重复读库与计算。
+MARKET_CACHE_TTL_SECONDS = {"1m": 30, "15m": 120, "1h": 300, "4h": 600, "1d": 1800}
+DEFAULT_MARKET_CACHE_TTL = 60
+MARKET_CACHE_MAX_ENTRIES = 512
+_market_cache: Dict[tuple, str] = {}
+_market_cache_lock = threading.Lock()
+
+
+def clear_market_cache() -> None:
+    """清空行情 TTL 缓存（K 线写库后调用，保证后续读取到最新数据）。"""
+    with _market_cache_lock:
+        _market_cache.clear()
+    _load_prepared_dataframe.cache_clear()
+
+
+def _ttl_cached(func: Callable[..., str]) -> Callable[..., str]:
+    """按 interval 对应的 TTL 分桶缓存 (symbol, interval, limit) 的结果。"""
+
+    @functools.wraps(func)
+    def wrapper(symbol: str, interval: str = "1h", limit: int = 240) -> str:
+        ttl = MARKET_CACHE_TTL_SECONDS.get(interval, DEFAULT_MARKET_CACHE_TTL)
+        key = (func.__name__, symbol.upper(), interval, int(limit), int(time.time() // ttl))
+        with _market_cache_lock:
+            cached = _market_cache.get(key)
+        if cached is not None:
+            return cached
+        result = func(symbol, interval=interval, limit=limit)
+        with _market_cache_lock:
+            if len(_market_cache) >= MARKET_CACHE_MAX_ENTRIES:
+                _market_cache.clear()
+            _market_cache[key] = result
+        return result
+
+    return wrapper
+
 
 def get_table_for_interval(interval: str) -> str:
     """
@@ -238,6 +277,32 @@ def ensure_indicator_data(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+@functools.lru_cache(maxsize=64)
+def _load_prepared_dataframe(
+    symbol: str,
+    interval: str,
+    limit: int,
+    ttl_bucket: int,
+) -> pd.DataFrame:
+    """读库并构造带指标列的 DataFrame；ttl_bucket 仅参与缓存键，用于按时间失效。"""
+    klines = load_cached_klines(symbol, interval=interval, limit=limit)
+    return ensure_indicator_data(klines_to_dataframe(klines))
+
+
+def _prepared_dataframe(symbol: str, interval: str, limit: int) -> pd.DataFrame:
+    """
+    获取 (symbol, interval, limit) 对应的指标 DataFrame，快照与支撑/阻力分析共享同一份结果
+
+    返回缓存帧的浅拷贝：调用方新增/替换列（df[col] = ...）只影响自己的副本；
+    底层数据数组仍与缓存共享，禁止 df.loc/iloc 等原地改值，需要改值时先 df.copy()。
+    """
+    ttl = MARKET_CACHE_TTL_SECONDS.get(interval, DEFAULT_MARKET_CACHE_TTL)
+    cached = _load_prepared_dataframe(
+        symbol.upper(), interval, int(limit), int(time.time() // ttl)
+    )
+    return cached.copy(deep=False)
+
+
 def summarize_market(
     df: pd.DataFrame,
     symbol: str,
@@ -291,6 +356,7 @@ def summarize_market(
     )
 
 
+@_ttl_cached
 def get_market_snapshot(
     symbol: str,
     interval: str = "1h",
@@ -307,10 +373,8 @@ def get_market_snapshot(
     Returns:
         市场快照字符串
     """
-    # 获取缓存的K线数据
-    klines = load_cached_klines(symbol, interval=interval, limit=limit)
-    # 将K线数据转换为DataFrame并确保包含技术指标列
-    df = ensure_indicator_data(klines_to_dataframe(klines))
+    # 获取带技术指标列的K线DataFrame（同周期内与其他工具共享）
+    df = _prepared_dataframe(symbol, interval, limit)
     # 生成市场摘要
     return summarize_market(df, symbol=symbol, interval=interval, window=limit)
 
@@ -331,10 +395,8 @@ def get_support_resistance_levels(
     Returns:
         包含支撑位、阻力位信息的字典
     """
-    # 获取缓存的K线数据
-    klines = load_cached_klines(symbol, interval=interval, limit=limit)
-    # 将K线数据转换为DataFrame并确保包含技术指标列
-    df = ensure_indicator_data(klines_to_dataframe(klines))
+    # 获取带技术指标列的K线DataFrame（同周期内与其他工具共享）
+    df = _prepared_dataframe(symbol, interval, limit)
     # 初始化基础字典
     base: Dict[str, Any] = {
         "symbol": symbol,
@@ -350,40 +412,46 @@ def get_support_resistance_levels(
     # 获取当前收盘价
     current_close = df["close"].iloc[-1]
     
+    # 高/低价列只转换一次为 ndarray，峰值检测与取值都直接在数组上进行，
+    # 避免 find_peaks 内部再转换 Series 以及 df.iloc[...] 构造子 DataFrame。
+    highs = df["high"].to_numpy(dtype=float)
+    lows = df["low"].to_numpy(dtype=float)
+    recent_window = min(252, len(df))
+
     # 1. 识别强峰值（阻力位）
     strong_resistance_peaks, _ = find_peaks(
-        df['high'], 
-        distance=60, 
+        highs,
+        distance=60,
         prominence=200
     )
-    
+
     # 提取强峰值的对应高值
-    strong_resistances = df.iloc[strong_resistance_peaks]['high'].tolist()
-    
+    strong_resistances = highs[strong_resistance_peaks].tolist()
+
     # 包括近期最高价作为额外的强峰值
-    recent_high = df['high'].iloc[-min(252, len(df)):].max()
+    recent_high = highs[-recent_window:].max()
     strong_resistances.append(recent_high)
-    
+
     # 去重
     strong_resistances = list(set(strong_resistances))
-    
+
     # 2. 识别强谷值（支撑位）
     strong_support_troughs, _ = find_peaks(
-        -df['low'], 
-        distance=60, 
+        -lows,
+        distance=60,
         prominence=200
     )
-    
+
     # 提取强谷值的对应低值
-    strong_supports = df.iloc[strong_support_troughs]['low'].tolist()
-    
+    strong_supports = lows[strong_support_troughs].tolist()
+
     # 包括近期最低价作为额外的强谷值
-    recent_low = df['low'].iloc[-min(252, len(df)):].min()
+    recent_low = lows[-recent_window:].min()
     strong_supports.append(recent_low)
-    
+
     # 去重
     strong_supports = list(set(strong_supports))
-    
+
     # 根据当前价格过滤支撑位和阻力位
     # 支撑位应该是当前价格下方的价格水平
     filtered_supports = [s for s in strong_supports if s <= current_close]
@@ -402,6 +470,7 @@ def get_support_resistance_levels(
     return base
 
 
+@_ttl_cached
 def analyze_support_resistance(
     symbol: str,
     interval: str = "1h",
@@ -7,6 +7,7 @@ account configured via environment variables.
 """
 
 import os
+import threading
 from decimal import Decimal, InvalidOperation, ROUND_DOWN
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
@@ -542,10 +543,14 @@ class BinanceFuturesService:
 
 
 _SERVICE: Optional[BinanceFuturesService] = None
+_SERVICE_LOCK = threading.Lock()
 
 
 def get_service() -> BinanceFuturesService:
+    """进程内单例；API 线程、定时任务与反思线程池可能并发首次调用，用锁保证只初始化一次。"""
     global _SERVICE
     if _SERVICE is None:
-        _SERVICE = BinanceFuturesService.from_env()
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = BinanceFuturesService.from_env()
     return _SERVICE
@@ -1,13 +1,26 @@
+import functools
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 DATA_DIR = BASE_DIR / "data"
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "odaily_rss.db"
 
+# 候选列表的进程内 TTL 缓存：Agent 在同一轮推理中常以相同参数重复调用新闻工具，
+# 有效期内直接复用查询结果；RSS 同步写库后由 clear_candidate_cache 失效。
+NEWSFLASH_CANDIDATE_TTL_SECONDS = 30
+ARTICLE_CANDIDATE_TTL_SECONDS = 300
+CANDIDATE_CACHE_MAX_ENTRIES = 128
+_candidate_cache: Dict[tuple, tuple] = {}
+_candidate_cache_lock = threading.Lock()
+
+_EntryFetcher = Callable[..., List[Dict[str, Any]]]
+
 
 def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
@@ -21,6 +34,36 @@ def _ensure_columns(conn: sqlite3.Connection, table: str, columns: Dict[str, str
             conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {col_type}")
 
 
+def clear_candidate_cache() -> None:
+    """清空候选列表 TTL 缓存（RSS 写库后调用，保证后续读取到最新数据）。"""
+    with _candidate_cache_lock:
+        _candidate_cache.clear()
+
+
+def _ttl_cache(seconds: int) -> Callable[[_EntryFetcher], _EntryFetcher]:
+    """按调用参数缓存查询结果 seconds 秒，返回浅拷贝避免调用方修改缓存。"""
+
+    def decorator(func: _EntryFetcher) -> _EntryFetcher:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> List[Dict[str, Any]]:
+            key = (func.__name__, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _candidate_cache_lock:
+                cached = _candidate_cache.get(key)
+            if cached is not None and cached[0] > now:
+                return list(cached[1])
+            result = func(*args, **kwargs)
+            with _candidate_cache_lock:
+                if len(_candidate_cache) >= CANDIDATE_CACHE_MAX_ENTRIES:
+                    _candidate_cache.clear()
+                _candidate_cache[key] = (now + seconds, result)
+            return list(result)
+
+        return wrapper
+
+    return decorator
+
+
 def ensure_db() -> None:
     with sqlite3.connect(DB_PATH) as conn:
         conn.execute(
@@ -167,6 +210,42 @@ def _query_newsflash_by_id(entry_id: str) -> Optional[Dict[str, Any]]:
     return dict(row) if row else None
 
 
+def _query_newsflash_by_ids(entry_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """一次查询多个快讯，返回 {请求的 id: 记录}；entry_id 精确匹配优先于 guid。"""
+    ids = list(dict.fromkeys(entry_ids))
+    if not ids:
+        return {}
+    ensure_db()
+    placeholders = ",".join("?" * len(ids))
+    with sqlite3.connect(DB_PATH) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            f"""
+            SELECT entry_id, title, summary, content, link,
+                   published, tags, raw_json, fetched_at,
+                   category, author, guid
+            FROM newsflash
+            WHERE entry_id IN ({placeholders}) OR guid IN ({placeholders})
+            """,
+            (*ids, *ids),
+        ).fetchall()
+
+    by_entry_id: Dict[str, Dict[str, Any]] = {}
+    by_guid: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        record = dict(row)
+        by_entry_id.setdefault(record["entry_id"], record)
+        if record.get("guid"):
+            by_guid.setdefault(record["guid"], record)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for entry_id in ids:
+        record = by_entry_id.get(entry_id) or by_guid.get(entry_id)
+        if record:
+            results[entry_id] = record
+    return results
+
+
 def get_newsflash(
     limit: int = 20,
     lookback_hours: int = 24,
@@ -177,6 +256,7 @@ def get_newsflash(
     return _query_entries("newsflash", limit, cutoff)
 
 
+@_ttl_cache(NEWSFLASH_CANDIDATE_TTL_SECONDS)
 def get_newsflash_candidates(
     limit: int = 20,
     lookback_hours: int = 24,
@@ -200,6 +280,7 @@ def get_articles(
     return _query_entries("articles", limit, cutoff)
 
 
+@_ttl_cache(ARTICLE_CANDIDATE_TTL_SECONDS)
 def get_article_candidates(
     limit: int = 20,
     lookback_days: int = 7,
@@ -224,6 +305,10 @@ def get_newsflash_content_by_id(entry_id: str) -> Optional[Dict[str, Any]]:
     return _query_newsflash_by_id(entry_id)
 
 
+def get_newsflash_content_by_ids(entry_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    return _query_newsflash_by_ids(entry_ids)
+
+
 GLOBAL_LONGFORM_KEY = "__GLOBAL_LONGFORM__"
 
 
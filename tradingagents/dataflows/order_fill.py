@@ -0,0 +1,69 @@
+"""
+Binance 市价单成交回报的解析工具。
+
+不依赖 binance SDK，便于执行层与单元测试直接使用。
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+def _first_value(payload: Dict[str, Any], *keys: str) -> Optional[Any]:
+    """按顺序返回第一个非 None 的字段值（0 / "0" 等取值同样有效）。"""
+    for key in keys:
+        value = payload.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _first_float(payload: Dict[str, Any], *keys: str) -> Optional[float]:
+    """按顺序返回第一个可解析为 float 的字段值；无法解析时继续尝试后续字段名。"""
+    for key in keys:
+        value = payload.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+@dataclass
+class OrderFill:
+    """市价单成交回报的统一视图（兼容 camelCase / snake_case 两种字段名）。"""
+
+    symbol: Optional[str]
+    side: Optional[str]
+    order_id: Optional[Any]
+    executed_qty: Optional[float]
+    avg_price: Optional[float]
+    cum_quote: Optional[float]
+    # 交易所原样返回的成交数量，仅用于展示，避免 float 转换带来的格式变化
+    executed_qty_text: Optional[str] = None
+
+    @classmethod
+    def from_response(cls, resp: Dict[str, Any]) -> "OrderFill":
+        raw_qty = _first_value(resp, "executedQty", "executed_qty")
+        return cls(
+            symbol=resp.get("symbol"),
+            side=resp.get("side"),
+            order_id=_first_value(resp, "orderId", "order_id"),
+            executed_qty=_first_float(resp, "executedQty", "executed_qty"),
+            avg_price=_first_float(resp, "avgPrice", "avg_price"),
+            cum_quote=_first_float(resp, "cumQuote", "cum_quote"),
+            executed_qty_text=None if raw_qty is None else str(raw_qty),
+        )
+
+    @property
+    def notional(self) -> Optional[float]:
+        """实际成交名义（USDT）：优先 cumQuote，其次 avgPrice × executedQty。
+
+        0 成交（如 ACK 回报）返回 0.0 而不是 None，调用方据此提示成交不足。
+        """
+        if self.cum_quote is not None:
+            return self.cum_quote
+        if self.avg_price is not None and self.executed_qty is not None:
+            return self.avg_price * self.executed_qty
+        return None
@@ -25,6 +25,13 @@ DEFAULT_CONFIG = {
     ),
     "longform_llm_provider": os.getenv("TRADINGAGENTS_LONGFORM_LLM_PROVIDER", "dashscope"),
     "longform_llm_model": os.getenv("TRADINGAGENTS_LONGFORM_LLM_MODEL", "qwen-turbo"),
+    # 精确匹配的 LLM 响应缓存（进程内），默认关闭；开启后相同 prompt 的重试/回放不再重复请求
+    "llm_response_cache": os.getenv("TRADINGAGENTS_LLM_RESPONSE_CACHE", "").lower()
+    in ("1", "true", "yes"),
+    "llm_response_cache_size": 256,
+    # Trader 以流式方式调用 LLM（节点内汇总为完整回复），默认关闭
+    "trader_streaming": os.getenv("TRADINGAGENTS_TRADER_STREAMING", "").lower()
+    in ("1", "true", "yes"),
     # Memory settings
     "use_chroma_memory": True,
     "chroma_path": os.path.join(
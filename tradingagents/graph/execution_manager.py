@@ -1,11 +1,12 @@
 
-import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, List
+from typing import Any, Dict, Optional
 
+from tradingagents.agents.utils.json_utils import extract_json_object, json_dumps
 from tradingagents.dataflows.trader_round_memory import TraderRoundMemoryStore
 from tradingagents.dataflows.binance_future import get_service
+from tradingagents.dataflows.order_fill import OrderFill
 
 logger = logging.getLogger(__name__)
 
@@ -43,20 +44,19 @@ class ExecutionManager:
         4. 更新 state 中的 `final_trade_decision`，包含风控结果和执行结果。
         """
         plan_text = state.get("trader_investment_plan") or ""
-        plan = self._extract_plan_json(plan_text)
+        plan = extract_json_object(plan_text)
         adjustments: list[str] = []
         warnings: list[str] = []
         execution_results: list[Dict[str, Any]] = []
 
         if not plan:
             warnings.append("未能解析交易员计划 JSON，跳过风控与执行。")
-            state["final_trade_decision"] = json.dumps(
+            state["final_trade_decision"] = json_dumps(
                 {
                     "risk_control": {"warnings": warnings},
                     "execution": execution_results,
                     "trader_plan_raw": plan_text,
-                },
-                ensure_ascii=False,
+                }
             )
             return state
 
@@ -298,19 +298,20 @@ class ExecutionManager:
                 )
 
         # 更新状态，序列化最终决策供后续步骤或前端使用
-        state["trader_investment_plan"] = json.dumps(plan, ensure_ascii=False)
-        state["final_trade_decision"] = json.dumps(
-            {
-                "risk_control": {
-                    "max_loss_per_trade": 0.10,
-                    "adjustments": adjustments,
-                    "warnings": warnings,
-                },
-                "execution": execution_results,
-                "trader_plan": plan,
+        final_decision = {
+            "risk_control": {
+                "max_loss_per_trade": 0.10,
+                "adjustments": adjustments,
+                "warnings": warnings,
             },
-            ensure_ascii=False,
-        )
+            "execution": execution_results,
+            "trader_plan": plan,
+        }
+        state["trader_investment_plan"] = json_dumps(plan)
+        state["final_trade_decision"] = json_dumps(final_decision)
+        # 同时保留已解析的结构，供 PersistenceManager 直接复用，避免再次解析 JSON。
+        state["_trader_plan"] = plan
+        state["_final_decision"] = final_decision
         pending = [
             item["trade_info"] for item in execution_results if item.get("trade_info")
         ]
@@ -401,17 +402,8 @@ class ExecutionManager:
                 )
             except Exception as exc:
                 return str(exc), leverage_result, protection_result
-            avg_price = resp.get("avgPrice") or resp.get("avg_price")
-            cum_quote = resp.get("cumQuote") or resp.get("cum_quote")
-            executed_qty = resp.get("executedQty") or resp.get("executed_qty")
-            actual_usdt = None
-            try:
-                if cum_quote:
-                    actual_usdt = float(cum_quote)
-                elif avg_price and executed_qty:
-                    actual_usdt = float(avg_price) * float(executed_qty)
-            except (TypeError, ValueError):
-                actual_usdt = None
+            fill = OrderFill.from_response(resp)
+            actual_usdt = fill.notional
             actual_text = (
                 f"，实际名义≈{actual_usdt:.2f} USDT"
                 if actual_usdt is not None
@@ -425,8 +417,8 @@ class ExecutionManager:
             ):
                 shortfall_text = "（实际成交名义低于计划，可能因余额/限额/最小下单量）"
             entry_result = (
-                f"下单成功：{resp.get('symbol')} {resp.get('side')} 数量 {executed_qty} "
-                f"（计划名义 {target_notional} USDT{actual_text}）{shortfall_text}，订单 ID {resp.get('orderId')}。"
+                f"下单成功：{fill.symbol} {fill.side} 数量 {fill.executed_qty_text} "
+                f"（计划名义 {target_notional} USDT{actual_text}）{shortfall_text}，订单 ID {fill.order_id}。"
                 "（已在下单前自动清理历史止盈/止损委托，记得立即设置新的保护价）"
             )
             try:
@@ -551,22 +543,6 @@ class ExecutionManager:
             "notes": "",
         }
 
-    @staticmethod
-    def _extract_plan_json(plan_text: str) -> Optional[Dict[str, Any]]:
-        if not plan_text:
-            return None
-        try:
-            return json.loads(plan_text)
-        except Exception:
-            start = plan_text.find("{")
-            end = plan_text.rfind("}")
-            if start == -1 or end == -1 or end <= start:
-                return None
-            try:
-                return json.loads(plan_text[start : end + 1])
-            except Exception:
-                return None
-
     @staticmethod
     def _coerce_float(value: Any) -> Optional[float]:
         if value is None:
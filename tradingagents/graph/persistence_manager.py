@@ -1,9 +1,9 @@
 
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+from tradingagents.agents.utils.json_utils import extract_json_object, json_dumps
 from tradingagents.dataflows.trader_round_memory import TraderRoundMemoryStore
 from tradingagents.dataflows.trace_store import TraceStore
 
@@ -27,6 +27,8 @@ class PersistenceManager:
     ):
         self.trader_round_store = trader_round_store
         self.trace_store = trace_store
+        # 单条快照缓存：(三份报告, 快照 JSON)，同一轮内的多次调用直接复用
+        self._snapshot_cache: Optional[tuple] = None
 
     def persist_trace_snapshot(self, state: Dict[str, Any]) -> None:
         """
@@ -37,9 +39,10 @@ class PersistenceManager:
         部分就是通过读取这里的数据来展示的。
         """
         plan_text = state.get("trader_investment_plan") or ""
-        plan = self._extract_plan_json(plan_text) or {}
-        final_decision_text = state.get("final_trade_decision") or ""
-        final_decision = self._extract_plan_json(final_decision_text) or {}
+        plan = self._resolve_parsed(state, "_trader_plan", "trader_investment_plan")
+        final_decision = self._resolve_parsed(
+            state, "_final_decision", "final_trade_decision"
+        )
 
         # 只保留一个资产计划摘要，便于前端快速展示。
         trade_plan_summary = None
@@ -120,7 +123,7 @@ class PersistenceManager:
         }
 
         try:
-            payload_text = json.dumps(trace_payload, ensure_ascii=False)
+            payload_text = json_dumps(trace_payload)
             self.trace_store.add_trace(payload_text, trace_payload["created_at"])
         except Exception:
             logger.warning("写入 trace 失败", exc_info=True)
@@ -133,8 +136,7 @@ class PersistenceManager:
         1. Agent 下一轮运行时，检索“最近几轮的决策”，以保持连贯性。
         2. 记录入场时的 Thesis (理由)，以便在平仓时进行复盘对比。
         """
-        plan_text = state.get("trader_investment_plan") or ""
-        plan = self._extract_plan_json(plan_text) or {}
+        plan = self._resolve_parsed(state, "_trader_plan", "trader_investment_plan")
         summary_data = self._build_trader_round_summary(state, plan)
         if summary_data:
             self.trader_round_store.add_round(**summary_data)
@@ -152,9 +154,7 @@ class PersistenceManager:
             monitoring_prices = risk.get("monitoring_prices")
             if monitoring_prices is not None and not isinstance(monitoring_prices, str):
                 try:
-                    monitoring_prices = json.dumps(
-                        monitoring_prices, ensure_ascii=False
-                    )
+                    monitoring_prices = json_dumps(monitoring_prices)
                 except Exception:
                     monitoring_prices = None
             self.trader_round_store.upsert_monitoring_targets(
@@ -201,15 +201,28 @@ class PersistenceManager:
         当需要进行“交易复盘 (Reflection)”时，我们需要知道当时的市场环境（市场报告、新闻、叙事）。
         这个方法提取最重要的摘要信息，打包成 JSON 字符串，作为交易记忆的一部分存下来。
         """
-        market = self._summarize_market_report(state.get("market_report"))
-        newsflash = self._summarize_newsflash_report(state.get("newsflash_report"))
-        longform = self._summarize_longform_report(state.get("longform_report"))
+        reports = (
+            state.get("market_report"),
+            state.get("newsflash_report"),
+            state.get("longform_report"),
+        )
+        # 同一轮中开仓摘要、交易所平仓检测与复盘会对同一组报告重复构建快照。
+        # 报告在一轮内不变，tuple 比较会先走身份判断，命中时几乎无开销。
+        cached = self._snapshot_cache
+        if cached is not None and cached[0] == reports:
+            return cached[1]
+
+        market = self._summarize_market_report(reports[0])
+        newsflash = self._summarize_newsflash_report(reports[1])
+        longform = self._summarize_longform_report(reports[2])
         snapshot = {
             "market": market,
             "newsflash": newsflash,
             "longform": longform,
         }
-        return json.dumps(snapshot, ensure_ascii=False)
+        snapshot_text = json_dumps(snapshot)
+        self._snapshot_cache = (reports, snapshot_text)
+        return snapshot_text
 
     def _build_trader_round_summary(
         self, state: Dict[str, Any], plan: Dict[str, Any]
@@ -273,26 +286,7 @@ class PersistenceManager:
         }
 
     def _extract_report_json(self, raw: Any) -> Optional[Dict[str, Any]]:
-        if not raw:
-            return None
-        if isinstance(raw, dict):
-            return raw
-        if not isinstance(raw, str):
-            raw = str(raw)
-        raw = raw.strip()
-        if not raw:
-            return None
-        try:
-            return json.loads(raw)
-        except Exception:
-            start = raw.find("{")
-            end = raw.rfind("}")
-            if start == -1 or end == -1 or end <= start:
-                return None
-            try:
-                return json.loads(raw[start : end + 1])
-            except Exception:
-                return None
+        return extract_json_object(raw)
 
     def _summarize_market_report(self, raw: Any) -> Dict[str, Any]:
         data = self._extract_report_json(raw) or {}
@@ -352,9 +346,15 @@ class PersistenceManager:
 
     @staticmethod
     def _truncate_text(text: Any, limit: int = 600) -> str:
-        raw = text or ""
-        if not isinstance(raw, str):
-            raw = str(raw)
+        if not text:
+            return ""
+        raw = text if isinstance(text, str) else str(text)
+        if len(raw) <= limit:
+            return raw.strip()
+        # 长文本只在截断后的前缀上去空白，避免为整段报告生成 strip 拷贝；
+        # 首尾带空白时回退到完整 strip，保证与原逻辑结果一致。
+        if not (raw[0].isspace() or raw[-1].isspace()):
+            return raw[:limit].rstrip() + "..."
         raw = raw.strip()
         if len(raw) <= limit:
             return raw
@@ -367,25 +367,18 @@ class PersistenceManager:
         if isinstance(value, str):
             return value
         try:
-            return json.dumps(value, ensure_ascii=False)
+            return json_dumps(value)
         except Exception:
             return str(value)
 
-    @staticmethod
-    def _extract_plan_json(plan_text: str) -> Optional[Dict[str, Any]]:
-        if not plan_text:
-            return None
-        try:
-            return json.loads(plan_text)
-        except Exception:
-            start = plan_text.find("{")
-            end = plan_text.rfind("}")
-            if start == -1 or end == -1 or end <= start:
-                return None
-            try:
-                return json.loads(plan_text[start : end + 1])
-            except Exception:
-                return None
+    def _resolve_parsed(
+        self, state: Dict[str, Any], parsed_key: str, text_key: str
+    ) -> Dict[str, Any]:
+        """优先复用 ExecutionManager 写入的已解析结构，缺失时再解析 JSON 文本。"""
+        parsed = state.get(parsed_key)
+        if isinstance(parsed, dict):
+            return parsed
+        return extract_json_object(state.get(text_key) or "") or {}
 
     @staticmethod
     def _coerce_float(value: Any) -> Optional[float]:
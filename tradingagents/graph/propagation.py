@@ -1,6 +1,6 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any, Iterable, List, Sequence, Union
+from typing import Dict, Any, List, Sequence, Union
 from tradingagents.agents.utils.agent_states import InvestDebateState
 
 
@@ -20,6 +20,7 @@ class GraphSetup:
         tool_nodes: Dict[str, ToolNode],
         trader_round_store,
         conditional_logic: ConditionalLogic,
+        trader_streaming: bool = False,
     ):
         """注入所有依赖的 LLM、工具节点、记忆与条件逻辑。"""
         self.quick_thinking_llm: Any = quick_thinking_llm
@@ -27,6 +28,7 @@ class GraphSetup:
         self.tool_nodes = tool_nodes
         self.trader_round_store = trader_round_store
         self.conditional_logic = conditional_logic
+        self.trader_streaming = trader_streaming
 
     def setup_graph(
         self, selected_analysts=["market", "newsflash", "longform"]
@@ -75,7 +77,9 @@ class GraphSetup:
             self.quick_thinking_llm
         )
         trader_node = create_trader(
-            self.deep_thinking_llm, self.trader_round_store
+            self.deep_thinking_llm,
+            self.trader_round_store,
+            stream=self.trader_streaming,
         )
 
         # 创建状态图
@@ -120,47 +124,26 @@ class GraphSetup:
             workflow.add_edge(current_tools, current_analyst)
             return current_clear
 
-        # 并行分析师的布线：需要等所有并行节点完成才放行
+        # 并行分析师的布线：各分支的清理节点汇合到同一个多源边，
+        # LangGraph 会在所有来源节点都完成后才触发下游节点（fan-in 屏障）。
         if parallel_analysts:
-            gate_node_name = "Parallel Analyst Gate"
-            wait_node_name = "Parallel Analyst Wait"
-            workflow.add_node(gate_node_name, lambda state: {})
-            workflow.add_node(wait_node_name, lambda state: {})
-
             next_after_parallel = (
                 f"{remaining_analysts[0].capitalize()} Analyst"
                 if remaining_analysts
                 else "Bull Researcher"
             )
 
-            def _should_release_parallel(state: AgentState):
-                if "market" in parallel_analysts and not state["market_report"]:
-                    return "wait"
-                if "newsflash" in parallel_analysts and not state["newsflash_report"]:
-                    return "wait"
-                if "longform" in parallel_analysts and not state["longform_report"]:
-                    return "wait"
-                return "proceed"
-
+            parallel_clears = []
             for analyst_type in parallel_analysts:
+                cap_name = analyst_type.capitalize()
+                workflow.add_edge(START, f"{cap_name} Analyst")
                 if analyst_type in ["market", "newsflash"]:
-                    current_clear = _wire_tool_driven(analyst_type)
-                    workflow.add_edge(START, f"{analyst_type.capitalize()} Analyst")
-                    workflow.add_edge(current_clear, gate_node_name)
+                    parallel_clears.append(_wire_tool_driven(analyst_type))
                 elif analyst_type == "longform":
-                    cap_name = analyst_type.capitalize()
-                    workflow.add_edge(START, f"{cap_name} Analyst")
                     workflow.add_edge(f"{cap_name} Analyst", f"Msg Clear {cap_name}")
-                    workflow.add_edge(f"Msg Clear {cap_name}", gate_node_name)
+                    parallel_clears.append(f"Msg Clear {cap_name}")
 
-            workflow.add_conditional_edges(
-                gate_node_name,
-                _should_release_parallel,
-                {
-                    "proceed": next_after_parallel,
-                    "wait": wait_node_name,
-                },
-            )
+            workflow.add_edge(parallel_clears, next_after_parallel)
         elif remaining_analysts:
             workflow.add_edge(START, f"{remaining_analysts[0].capitalize()} Analyst")
         else:
@@ -7,7 +7,9 @@ from datetime import date, datetime, timezone
 from typing import Dict, Any, Optional, cast
 from concurrent.futures import ThreadPoolExecutor
 
+import httpx
 from langchain_openai import ChatOpenAI
+from langchain_core.caches import InMemoryCache
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_google_genai import ChatGoogleGenerativeAI
 
@@ -41,6 +43,18 @@ from .propagation import Propagator
 from .execution_manager import ExecutionManager
 from .persistence_manager import PersistenceManager
 
+_SHARED_HTTP_CLIENT: Optional[httpx.Client] = None
+
+
+def _shared_http_client() -> httpx.Client:
+    """所有 OpenAI 兼容模型共享同一个 httpx 连接池，跨节点复用 keep-alive 连接。"""
+    global _SHARED_HTTP_CLIENT
+    if _SHARED_HTTP_CLIENT is None:
+        _SHARED_HTTP_CLIENT = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=32)
+        )
+    return _SHARED_HTTP_CLIENT
+
 
 class _FallbackChatModel(BaseChatModel):
     """
@@ -143,6 +157,14 @@ class TradingAgentsGraph:
             self.config.get("deep_backend_url") or self.config["backend_url"]
         )
 
+        # 可选的精确匹配响应缓存：完全相同的 prompt（重试/回放）直接复用上次结果。
+        # 只挂在分析/辩论/交易用的模型上，复盘模型不缓存。
+        self._llm_cache = (
+            InMemoryCache(maxsize=self.config.get("llm_response_cache_size", 256))
+            if self.config.get("llm_response_cache")
+            else None
+        )
+
         self.quick_thinking_llm = self._initialize_llm(
             provider=quick_provider,
             model_name=self.config["quick_think_llm"],
@@ -184,6 +206,7 @@ class TradingAgentsGraph:
             self.tool_nodes,
             self.trader_round_store,
             self.conditional_logic,
+            trader_streaming=bool(self.config.get("trader_streaming")),
         )
 
         self.propagator = Propagator(self.config.get("max_recur_limit", 100))
@@ -202,11 +225,17 @@ class TradingAgentsGraph:
             base = backend_url or "https://api.openai.com/v1"
             if provider == "openrouter" and backend_url is None:
                 base = "https://openrouter.ai/api/v1"
-            return ChatOpenAI(model=model_name, base_url=base, extra_body=extra_body)
+            return ChatOpenAI(
+                model=model_name,
+                base_url=base,
+                extra_body=extra_body,
+                http_client=_shared_http_client(),
+                cache=self._llm_cache,
+            )
         if provider == "deepseek":
             return self._initialize_deepseek_llm(model_name, backend_url, extra_body)
         if provider == "google":
-            return ChatGoogleGenerativeAI(model=model_name)
+            return ChatGoogleGenerativeAI(model=model_name, cache=self._llm_cache)
         raise ValueError(f"Unsupported LLM provider: {provider}")
 
     def _initialize_deepseek_llm(
@@ -228,6 +257,8 @@ class TradingAgentsGraph:
             base_url=base,
             api_key=SecretStr(primary_key),
             extra_body=extra_body,
+            http_client=_shared_http_client(),
+            cache=self._llm_cache,
         )
         # 如果使用官方 URL 作为 fallback，强制使用标准的 deepseek-chat 模型名
         # 因为 ModelScope 的模型名（如 deepseek-ai/DeepSeek-V3.2）在官方 API 会报 400
@@ -241,6 +272,8 @@ class TradingAgentsGraph:
             base_url=fallback_url,
             api_key=SecretStr(fallback_key),
             extra_body=extra_body,
+            http_client=_shared_http_client(),
+            cache=self._llm_cache,
         )
         return _FallbackChatModel(primary, fallback, fallback_base)
 
@@ -253,6 +286,7 @@ class TradingAgentsGraph:
             base_url="https://api.deepseek.com/v1",
             api_key=SecretStr(api_key),
             extra_body={"enable_thinking": False},
+            http_client=_shared_http_client(),
         )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
@@ -378,6 +412,10 @@ class TradingAgentsGraph:
         # 检查交易所是否已经自动平仓（止盈/止损触发），触发复盘并写入记录。
         self._detect_exchange_close_and_reflect(final_state, asset_symbols)
 
+        # 已解析的计划/决策只在本轮持久化阶段使用，不随最终状态返回。
+        final_state.pop("_trader_plan", None)
+        final_state.pop("_final_decision", None)
+
         # 如有平仓记录，触发复盘并写入记忆库。
         pending = final_state.pop("_pending_trade_info", None)
         if pending:
@@ -4,6 +4,7 @@ import json
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import threading
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Optional
@@ -14,7 +15,7 @@ from dotenv import load_dotenv
 from pydantic import SecretStr
 from langchain_openai import ChatOpenAI
 
-from tradingagents.graph.trading_graph import TradingAgentsGraph, _FallbackChatModel
+from tradingagents.graph.trading_graph import TradingAgentsGraph
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.analysts.crypto_longform_analyst import (
     create_crypto_longform_analyst,
@@ -72,6 +73,7 @@ DEFAULT_MAX_LEVERAGE = int(config.get("max_leverage", 3))
 
 # 初始化交易图（全局，避免重复初始化）
 ta: TradingAgentsGraph | None = None
+_ta_lock = threading.Lock()
 _longform_node = None
 _binance_first_run = True
 _alert_store: TraderRoundMemoryStore | None = None
@@ -88,16 +90,19 @@ def _get_alert_store() -> TraderRoundMemoryStore:
 
 
 def init_trading_graph():
-    """初始化交易图"""
+    """初始化交易图（进程内单例，API 服务与定时任务共用同一实例）"""
     global ta
-    if ta is None:
-        logger.info("正在初始化 TradingAgentsGraph...")
-        ta = TradingAgentsGraph(
-            debug=True,
-            config=config,
-            selected_analysts=["market", "newsflash", "longform"],
-        )
-        logger.info("TradingAgentsGraph 初始化完成")
+    if ta is not None:
+        return ta
+    with _ta_lock:
+        if ta is None:
+            logger.info("正在初始化 TradingAgentsGraph...")
+            ta = TradingAgentsGraph(
+                debug=True,
+                config=config,
+                selected_analysts=["market", "newsflash", "longform"],
+            )
+            logger.info("TradingAgentsGraph 初始化完成")
     return ta
 
 